@@ -0,0 +1 @@
+"""One command line for every tool in this repository; see jdr_tools.cli."""
@@ -0,0 +1,169 @@
+"""One `jdr_tools` command for every script in the repository.
+
+    jdr_tools --help
+    jdr_tools crawl --concurrency 6
+    jdr_tools transcribe talk.mp3 --backend faster-whisper
+    jdr_tools startup-check                 # time `--help` of every command against the budget
+
+Commands are a table of script names, so nothing is imported until one is picked, and
+then only that script. Its heavy backends (whisper/torch, playwright, boto3, edge-tts,
+tesseract, PyMuPDF) are imported on first use inside the script, so `--help` and option
+errors come back straight away. startup-check keeps it that way: it runs every
+`--help` in a fresh interpreter and fails if one is over budget or pulls in a backend,
+and tests/test_cli_startup.py runs the same check for every command whose extras are installed.
+
+The scripts import their neighbours by bare name, so each command puts its script
+directory on sys.path. `pip install .` ships the directories inside this package; in a
+checkout (or an editable install) they are found beside it.
+"""
+
+import atexit
+import importlib
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROG = "jdr_tools"
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(PACKAGE_DIR)  # the checkout, or site-packages once installed
+
+# command: (directory, module, summary); the module must have main(argv)
+COMMANDS = {
+    "crawl": ("tutorialsdojo_scripts", "td_crawl", "Scrape the Tutorials Dojo cheat sheets to markdown"),
+    "clean": ("tutorialsdojo_scripts", "clean_md", "Strip promo and navigation boilerplate from scraped sheets"),
+    "dedupe": ("tutorialsdojo_scripts", "dedupe_md", "Remove paragraphs repeated across many sheets"),
+    "pdf": ("tutorialsdojo_scripts", "md_to_pdf", "Convert the cheat sheet markdown to PDF with pandoc"),
+    "pipeline": ("tutorialsdojo_scripts", "td_pipeline", "Crawl, clean and convert in one streaming pass"),
+    "search": ("tutorialsdojo_scripts", "td_search", "Index and search the cleaned cheat sheets"),
+    "transcribe": ("transcription_tools", "transcribe_audio", "Transcribe audio with Whisper or faster-whisper"),
+    "tts": ("transcription_tools", "text_to_audio", "Read a text file aloud with edge-tts"),
+    "polly": ("transcription_tools", "polly_transcribe", "Read a text file aloud with Amazon Polly"),
+    "usage": ("transcription_tools", "usage_ledger", "Text-to-speech usage and cost by month"),
+    "ocr": ("transcription_tools", "pic_to_text", "OCR images and PDFs with tesseract"),
+    "scrape": ("simple_web_scraper", "book_catalogue", "Scrape books.toscrape.com into JSONL or CSV"),
+}
+
+STARTUP_BUDGET_SECONDS = 0.5  # wall time of `jdr_tools <command> --help`, interpreter start included
+STARTUP_REPEAT = 3
+# Backends that must never be imported just to parse arguments
+HEAVY_MODULES = ("torch", "whisper", "faster_whisper", "ctranslate2", "playwright", "boto3", "botocore",
+                 "edge_tts", "pytesseract", "fitz", "pdf2image")
+IMPORTS_ENV = "JDR_TOOLS_REPORT_IMPORTS"
+IMPORTS_MARKER = "jdr_tools imported:"
+
+
+def usage():
+    width = max(len(name) for name in [*COMMANDS, "startup-check"])
+    lines = [f"usage: {PROG} <command> [options]", "", "commands:"]
+    lines += [f"  {name:<{width}}  {summary}" for name, (_, _, summary) in COMMANDS.items()]
+    lines += [f"  {'startup-check':<{width}}  Time every command's --help against the startup budget",
+              "", f"Run '{PROG} <command> --help' for the options of one command."]
+    return "\n".join(lines)
+
+
+def script_dir(directory):
+    for root in (PACKAGE_DIR, REPO_DIR):
+        path = os.path.join(root, directory)
+        if os.path.isdir(path):
+            return path
+    raise FileNotFoundError(f"{directory}/ is neither inside {PACKAGE_DIR} nor beside it; "
+                            f"reinstall with `pip install .` from the repository root")
+
+
+def load_command(name):
+    directory, module, _ = COMMANDS[name]
+    path = script_dir(directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(module)
+
+
+def heavy_imports():
+    return sorted(name for name in HEAVY_MODULES if name in sys.modules)
+
+
+def report_imports():
+    print(IMPORTS_MARKER + ",".join(heavy_imports()), file=sys.stderr)
+
+
+def time_help(argv, repeat):
+    """Runs `jdr_tools <argv>` in fresh interpreters. Returns (median seconds, heavy imports, error)."""
+    env = dict(os.environ, **{IMPORTS_ENV: "1"})
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, "-m", PROG, *argv], cwd=REPO_DIR, env=env,
+                                capture_output=True, text=True)
+        timings.append(time.perf_counter() - started)
+        lines = result.stderr.splitlines()
+        if result.returncode != 0:
+            errors = [line for line in lines if line.strip() and not line.startswith(IMPORTS_MARKER)]
+            return None, [], errors[-1] if errors else f"exit status {result.returncode}"
+    reported = [line for line in lines if line.startswith(IMPORTS_MARKER)]
+    imported = reported[-1][len(IMPORTS_MARKER):].split(",") if reported else []
+    return statistics.median(timings), [name for name in imported if name], None
+
+
+def startup_check(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=f"{PROG} startup-check",
+                                     description="Time --help of each command in a fresh interpreter.")
+    parser.add_argument("commands", nargs="*", help="Commands to check (default: all)")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS,
+                        help=f"Seconds each --help may take (default {STARTUP_BUDGET_SECONDS})")
+    parser.add_argument("--repeat", type=int, default=STARTUP_REPEAT,
+                        help=f"Runs per command; the median counts (default {STARTUP_REPEAT})")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.commands if name not in COMMANDS]
+    if unknown:
+        parser.error(f"unknown command: {', '.join(unknown)}")
+
+    checks = [(PROG, ["--help"])] if not args.commands else []
+    checks += [(f"{PROG} {name}", [name, "--help"]) for name in args.commands or COMMANDS]
+    width = max(len(label) for label, _ in checks)
+    failed = 0
+    for label, command in checks:
+        seconds, imported, error = time_help(command, max(1, args.repeat))
+        if error:
+            status = f"FAIL {error}"
+        elif imported:
+            status = f"FAIL imported {', '.join(imported)}"
+        elif seconds > args.budget:
+            status = "FAIL over budget"
+        else:
+            status = "ok"
+        failed += status != "ok"
+        elapsed = f"{seconds * 1000:6.0f}ms" if seconds is not None else f"{'-':>8}"
+        print(f"{label:<{width}} {elapsed}  {status}")
+    print(f"{len(checks) - failed} of {len(checks)} within {args.budget * 1000:.0f}ms without loading a backend.")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if os.environ.get(IMPORTS_ENV):
+        atexit.register(report_imports)
+    if not argv:
+        print(usage(), file=sys.stderr)
+        return 2
+    command, args = argv[0], argv[1:]
+    if command in ("-h", "--help"):
+        print(usage())
+        return 0
+    if command == "startup-check":
+        return startup_check(args)
+    if command not in COMMANDS:
+        print(f"{usage()}\n\n{PROG}: unknown command '{command}'", file=sys.stderr)
+        return 2
+
+    try:
+        module = load_command(command)
+    except FileNotFoundError as e:
+        print(f"{PROG} {command}: {e}", file=sys.stderr)
+        return 1
+    # Each script's argparse names itself after argv[0]
+    sys.argv = [f"{PROG} {command}", *args]
+    return module.main(args)
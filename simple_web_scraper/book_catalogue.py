@@ -0,0 +1,156 @@
+# Scrape the whole books.toscrape.com catalogue to JSONL or CSV
+#
+#   python book_catalogue.py books.jsonl
+#   python book_catalogue.py books.csv --concurrency 20 --max-pages 5
+#
+# Listing pages are followed through their "next" links while the detail pages
+# they point to are fetched concurrently. Records are written as soon as they are
+# parsed, so memory use does not grow with the size of the catalogue.
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import time
+from urllib.parse import urljoin
+
+import httpx
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+from http_cache import HttpCache
+from http_client import AsyncHttpClient
+
+START_URL = "https://books.toscrape.com/catalogue/page-1.html"
+CACHE_DIR = ".http_cache"
+DEFAULT_CONCURRENCY = 10
+FIELDS = ["title", "price", "availability", "rating", "upc", "url"]
+RATINGS = {"One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5}
+PARSER = "lxml" if builder_registry.lookup("lxml") else "html.parser"
+
+
+class Stats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.listing_pages = 0
+        self.detail_pages = 0
+        self.records = 0
+        self.errors = 0
+
+    def report(self):
+        elapsed = time.monotonic() - self.started
+        pages = self.listing_pages + self.detail_pages
+        return (f"{pages} pages ({self.listing_pages} listing, {self.detail_pages} detail), "
+                f"{self.records} records, {self.errors} errors in {elapsed:.1f}s: "
+                f"{pages / elapsed:.1f} pages/s, {self.records / elapsed:.1f} records/s")
+
+
+def parse_listing(html, page_url):
+    """Returns (detail page URLs, next listing page URL or None)."""
+    soup = BeautifulSoup(html, PARSER)
+    details = [urljoin(page_url, a["href"]) for a in soup.select("article.product_pod h3 a[href]")]
+    next_link = soup.select_one("li.next a[href]")
+    return details, urljoin(page_url, next_link["href"]) if next_link else None
+
+
+def parse_book(html, url):
+    soup = BeautifulSoup(html, PARSER)
+    product = soup.select_one("div.product_main")
+    rating = product.select_one("p.star-rating")
+    table = {row.th.get_text(strip=True): row.td.get_text(strip=True)
+             for row in soup.select("table.table tr") if row.th and row.td}
+    return {
+        "title": product.h1.get_text(strip=True),
+        "price": product.select_one("p.price_color").get_text(strip=True),
+        "availability": product.select_one("p.availability").get_text(" ", strip=True),
+        "rating": next((RATINGS[c] for c in rating.get("class", []) if c in RATINGS), None) if rating else None,
+        "upc": table.get("UPC"),
+        "url": url,
+    }
+
+
+async def detail_urls(client, start_url, stats, max_pages=None):
+    """Walks the listing pages, yielding detail page URLs as each listing arrives."""
+    page_url = start_url
+    while page_url and (max_pages is None or stats.listing_pages < max_pages):
+        try:
+            response = await client.get(page_url)
+        except httpx.HTTPError as err:
+            # Without this page there is no "next" link; keep what was found so far
+            stats.errors += 1
+            logging.error(f"Listing page {page_url} failed, stopping pagination: {err}")
+            return
+        stats.listing_pages += 1
+        details, page_url = parse_listing(response.text, str(response.url))
+        for url in details:
+            yield url
+
+
+async def scrape_catalogue(client, start_url, stats, max_pages=None):
+    """Yields one record per book, in the order the detail pages finish downloading."""
+    async for result in client.fetch_many(detail_urls(client, start_url, stats, max_pages)):
+        stats.detail_pages += 1
+        if not result.ok:
+            stats.errors += 1
+            continue
+        try:
+            yield parse_book(result.response.text, result.url)
+        except (AttributeError, KeyError, TypeError) as err:
+            stats.errors += 1
+            logging.error(f"Could not parse {result.url}: {err}")
+
+
+async def write_records(records, path, stats):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            def write(record):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        async for record in records:
+            write(record)
+            stats.records += 1
+            if stats.records % 100 == 0:
+                logging.info(stats.report())
+
+
+async def run(args):
+    stats = Stats()
+    cache = HttpCache(args.cache_dir, offline=args.offline) if args.cache_dir else None
+    try:
+        async with AsyncHttpClient(concurrency=args.concurrency, cache=cache) as client:
+            records = scrape_catalogue(client, args.start_url, stats, args.max_pages)
+            await write_records(records, args.output, stats)
+    finally:
+        logging.info(stats.report())
+        if cache:
+            logging.info(f"Cache: {cache.stats()}")
+            cache.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape books.toscrape.com into JSONL or CSV.")
+    parser.add_argument("output", help="Output file; .csv writes CSV, anything else JSON lines")
+    parser.add_argument("--start-url", default=START_URL, help="First listing page")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Detail pages fetched in parallel (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--max-pages", type=int, help="Stop after this many listing pages")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help=f"HTTP cache directory (default {CACHE_DIR}); pass '' to disable")
+    parser.add_argument("--offline", action="store_true", help="Replay responses from the cache only")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
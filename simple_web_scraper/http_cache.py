@@ -0,0 +1,307 @@
+"""On-disk HTTP response cache with conditional revalidation and LRU eviction.
+
+    from http_cache import HttpCache, CachingTransport
+
+    cache = HttpCache(".http_cache")
+    client = HttpClient(cache=cache)       # or AsyncHttpClient(cache=cache)
+    raw = httpx.Client(transport=CachingTransport(cache))
+    response = fetch_url(url, cache=cache)
+
+Responses to GET/HEAD are stored in SQLite keyed by method + URL (query parameters
+sorted). Fresh entries (Cache-Control max-age / Expires, or `default_ttl` when the
+server says nothing) are served without a request; stale ones are revalidated with
+If-None-Match / If-Modified-Since and served from disk on 304. With `offline=True`
+every lookup is answered from the cache and a miss is an error, so extraction
+code can be rerun against stored responses without touching the network.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+CACHE_FILE = "responses.sqlite"
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+CACHEABLE_METHODS = {"GET", "HEAD"}
+CACHEABLE_STATUSES = {200, 203, 300, 301, 308, 404, 410}
+CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+# Bodies are stored decoded, so these no longer describe them
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+# What the caller should do with a request, as decided by HttpCache.plan()
+SERVE = "serve"
+REVALIDATE = "revalidate"
+FETCH = "fetch"
+PASS_THROUGH = "pass-through"  # caller sent its own validators; store the result only
+OFFLINE_MISS = "offline-miss"
+BYPASS = "bypass"  # not cacheable at all
+
+
+class CachedResponse(namedtuple("CachedResponse", ["key", "method", "url", "status", "headers", "body",
+                                                   "stored_at", "expires_at"])):
+    __slots__ = ()
+
+    def is_fresh(self, now=None):
+        return (now or time.time()) < self.expires_at
+
+    def validators(self):
+        headers = {}
+        if "etag" in self.headers:
+            headers["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+    def to_httpx(self, request):
+        return httpx.Response(self.status, headers=self.headers, content=self.body, request=request,
+                              extensions={"from_cache": True})
+
+
+def cache_key(method, url):
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    canonical = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+    return hashlib.sha256(f"{method.upper()} {canonical}".encode("utf-8")).hexdigest()
+
+
+def parse_cache_control(value):
+    directives = {}
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"')
+    return directives
+
+
+def freshness_lifetime(headers, default_ttl):
+    """Seconds a response stays fresh, or None if it must not be stored."""
+    directives = parse_cache_control(headers.get("cache-control", ""))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            return int(directives[name])
+    if "expires" in headers:
+        try:
+            expires = parsedate_to_datetime(headers["expires"]).timestamp()
+            date = parsedate_to_datetime(headers["date"]).timestamp() if "date" in headers else time.time()
+        except (TypeError, ValueError):
+            return 0  # An invalid Expires means already expired
+        return max(0, expires - date)
+    return default_ttl
+
+
+class HttpCache:
+    """SQLite-backed response store, safe to share between threads."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, default_ttl=0, offline=False):
+        os.makedirs(directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.offline = offline
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(directory, CACHE_FILE), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.hits = self.misses = self.revalidated = 0
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, method, url):
+        key = cache_key(method, url)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT method, url, status, headers, body, stored_at, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+        method, url, status, headers, body, stored_at, expires_at = row
+        return CachedResponse(key, method, url, status, httpx.Headers(json.loads(headers)), body,
+                              stored_at, expires_at)
+
+    def put(self, method, url, status, headers, body):
+        """Stores a response if it is cacheable. Returns the new entry or None.
+
+        `method` is only part of the key, so callers can keep other representations of a
+        URL next to the HTTP ones (td_crawl stores browser-rendered HTML as "RENDER").
+        """
+        if status not in CACHEABLE_STATUSES:
+            return None
+        headers = httpx.Headers([(k, v) for k, v in httpx.Headers(headers).multi_items()
+                                 if k.lower() not in DROPPED_HEADERS])
+        lifetime = freshness_lifetime(headers, self.default_ttl)
+        if lifetime is None:
+            return None
+
+        now = time.time()
+        entry = CachedResponse(cache_key(method, url), method.upper(), url, status, headers, body,
+                               now, now + lifetime)
+        with self._lock, self.conn:
+            old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (entry.key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry.key, entry.method, url, status, json.dumps(headers.multi_items()), body, len(body),
+                 now, entry.expires_at, now),
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            self._evict()
+        return entry
+
+    def refresh(self, entry, headers):
+        """Applies the headers of a 304 response to a stored entry and restarts its freshness."""
+        merged = httpx.Headers(entry.headers)
+        for name, value in httpx.Headers(headers).items():
+            if name.lower() not in DROPPED_HEADERS:
+                merged[name] = value
+        lifetime = freshness_lifetime(merged, self.default_ttl) or 0
+        now = time.time()
+        entry = entry._replace(headers=merged, stored_at=now, expires_at=now + lifetime)
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE responses SET headers = ?, stored_at = ?, expires_at = ?, last_access = ? WHERE key = ?",
+                (json.dumps(merged.multi_items()), now, entry.expires_at, now, entry.key),
+            )
+        return entry
+
+    def _evict(self):
+        # Caller holds the lock; drop least recently used entries until back under budget
+        while self._size > self.max_bytes:
+            rows = self.conn.execute("SELECT key, size FROM responses ORDER BY last_access LIMIT 100").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+                if self._size <= self.max_bytes:
+                    break
+
+    def plan(self, method, url, request_headers=None):
+        """Decides how to satisfy a request. Returns (entry or None, action)."""
+        if method.upper() not in CACHEABLE_METHODS:
+            return None, BYPASS
+        request_headers = httpx.Headers(request_headers or {})
+        if not self.offline and any(name in request_headers for name in CONDITIONAL_HEADERS):
+            # The caller is doing its own revalidation; stay out of the way but keep the result
+            return self.get(method, url), PASS_THROUGH
+
+        entry = self.get(method, url)
+        if self.offline:
+            if entry is None:
+                self.misses += 1
+                return None, OFFLINE_MISS
+            self.hits += 1
+            return entry, SERVE
+        if entry is None:
+            self.misses += 1
+            return None, FETCH
+        if entry.is_fresh():
+            self.hits += 1
+            return entry, SERVE
+        if entry.validators():
+            return entry, REVALIDATE
+        self.misses += 1
+        return entry, FETCH
+
+    def update(self, method, url, entry, action, status, headers, body):
+        """Records a network response. Returns the cached entry to serve instead of it,
+        or None when the network response should be returned as is."""
+        if status == 304 and entry is not None:
+            entry = self.refresh(entry, headers)
+            if action == REVALIDATE:
+                self.revalidated += 1
+                return entry
+            return None
+        self.put(method, url, status, headers, body)
+        return None
+
+    def stats(self):
+        return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses,
+                "size_mb": round(self._size / 1024 / 1024, 1)}
+
+
+class CachingTransport(httpx.BaseTransport):
+    """httpx transport that answers from an HttpCache where it can."""
+
+    def __init__(self, cache, transport=None):
+        self.cache = cache
+        self.transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request):
+        url = str(request.url)
+        entry, action = self.cache.plan(request.method, url, request.headers)
+        if action == BYPASS:
+            return self.transport.handle_request(request)
+        if action == SERVE:
+            return entry.to_httpx(request)
+        if action == OFFLINE_MISS:
+            raise httpx.RequestError(f"Offline mode: {url} is not in the cache", request=request)
+        if action == REVALIDATE:
+            request.headers.update(entry.validators())
+
+        response = self.transport.handle_request(request)
+        response.read()
+        cached = self.cache.update(request.method, url, entry, action, response.status_code,
+                                   response.headers, response.content)
+        return cached.to_httpx(request) if cached else response
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncCachingTransport(httpx.AsyncBaseTransport):
+    """Async twin of CachingTransport."""
+
+    def __init__(self, cache, transport=None):
+        self.cache = cache
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request):
+        url = str(request.url)
+        entry, action = self.cache.plan(request.method, url, request.headers)
+        if action == BYPASS:
+            return await self.transport.handle_async_request(request)
+        if action == SERVE:
+            return entry.to_httpx(request)
+        if action == OFFLINE_MISS:
+            raise httpx.RequestError(f"Offline mode: {url} is not in the cache", request=request)
+        if action == REVALIDATE:
+            request.headers.update(entry.validators())
+
+        response = await self.transport.handle_async_request(request)
+        await response.aread()
+        cached = self.cache.update(request.method, url, entry, action, response.status_code,
+                                   response.headers, response.content)
+        return cached.to_httpx(request) if cached else response
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,236 @@
+"""Pooled HTTP clients with retries, for scraping jobs over many URLs.
+
+    from http_client import HttpClient, AsyncHttpClient
+
+    with HttpClient() as client:
+        response = client.get("https://books.toscrape.com")
+        for result in client.fetch_many(urls):
+            print(result.url, result.response.status_code if result.ok else result.error)
+
+    async with AsyncHttpClient(concurrency=20) as client:
+        async for result in client.fetch_many(urls):
+            ...
+
+Both clients keep connections alive between requests, retry 429/5xx responses and
+transport errors with exponential backoff, and yield `fetch_many` results in
+completion order with at most `concurrency` requests in flight.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import httpx
+
+from http_cache import AsyncCachingTransport, CachingTransport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+DEFAULT_TIMEOUT = 10  # seconds
+DEFAULT_CONCURRENCY = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5  # seconds, doubled on every retry
+MAX_BACKOFF = 30  # seconds
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchResult(namedtuple("FetchResult", ["url", "response", "error"])):
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def backoff_delay(attempt, base=DEFAULT_BACKOFF, response=None):
+    """Seconds to wait before retry number `attempt` (0-based).
+
+    Honours a numeric Retry-After header, otherwise exponential backoff with full jitter.
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_BACKOFF)
+    return random.uniform(0, min(base * 2 ** attempt, MAX_BACKOFF))
+
+
+def should_retry(response):
+    return response.status_code in RETRY_STATUSES
+
+
+def client_options(headers, concurrency, timeout, client_kwargs):
+    options = {
+        "headers": {**DEFAULT_HEADERS, **(headers or {})},
+        "limits": httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        "timeout": timeout,
+        "follow_redirects": True,
+    }
+    options.update(client_kwargs)
+    return options
+
+
+class HttpClient:
+    """Synchronous client; `fetch_many` runs requests on a bounded thread pool."""
+
+    def __init__(self, headers=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, cache=None, **client_kwargs):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        if cache is not None:
+            client_kwargs.setdefault("transport", CachingTransport(cache))
+        self.client = httpx.Client(**client_options(headers, concurrency, timeout, client_kwargs))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.client.close()
+
+    def request(self, method, url, **kwargs):
+        """Sends a request, retrying 429/5xx and transport errors. Raises once retries run out."""
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.client.request(method, url, **kwargs)
+            except httpx.TransportError as err:
+                if attempt == self.retries:
+                    raise
+                delay = backoff_delay(attempt, self.backoff)
+                logger.warning(f"{method} {url} failed ({err!r}); retrying in {delay:.1f}s")
+            else:
+                if not should_retry(response) or attempt == self.retries:
+                    if response.status_code != 304:  # The answer to a conditional request, not an error
+                        response.raise_for_status()
+                    return response
+                delay = backoff_delay(attempt, self.backoff, response)
+                logger.warning(f"{method} {url} returned {response.status_code}; retrying in {delay:.1f}s")
+                response.close()
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def _fetch(self, url, method, kwargs):
+        try:
+            return FetchResult(url, self.request(method, url, **kwargs), None)
+        except httpx.HTTPError as err:
+            logger.error(f"Request to {url} failed: {err}")
+            return FetchResult(url, None, err)
+
+    def fetch_many(self, urls, method="GET", **kwargs):
+        """Yields a FetchResult per URL as each completes.
+
+        `urls` is consumed lazily, so it can be a generator over any number of URLs.
+        """
+        urls = iter(urls)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            pending = set()
+            for url in urls:
+                pending.add(pool.submit(self._fetch, url, method, kwargs))
+                if len(pending) >= self.concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+
+class AsyncHttpClient:
+    """asyncio client; `fetch_many` keeps at most `concurrency` requests in flight."""
+
+    def __init__(self, headers=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, cache=None, **client_kwargs):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        if cache is not None:
+            client_kwargs.setdefault("transport", AsyncCachingTransport(cache))
+        self.client = httpx.AsyncClient(**client_options(headers, concurrency, timeout, client_kwargs))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def request(self, method, url, **kwargs):
+        """Sends a request, retrying 429/5xx and transport errors. Raises once retries run out."""
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as err:
+                if attempt == self.retries:
+                    raise
+                delay = backoff_delay(attempt, self.backoff)
+                logger.warning(f"{method} {url} failed ({err!r}); retrying in {delay:.1f}s")
+            else:
+                if not should_retry(response) or attempt == self.retries:
+                    if response.status_code != 304:  # The answer to a conditional request, not an error
+                        response.raise_for_status()
+                    return response
+                delay = backoff_delay(attempt, self.backoff, response)
+                logger.warning(f"{method} {url} returned {response.status_code}; retrying in {delay:.1f}s")
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def _fetch(self, url, method, kwargs):
+        try:
+            return FetchResult(url, await self.request(method, url, **kwargs), None)
+        except httpx.HTTPError as err:
+            logger.error(f"Request to {url} failed: {err}")
+            return FetchResult(url, None, err)
+
+    async def fetch_many(self, urls, method="GET", **kwargs):
+        """Yields a FetchResult per URL as each completes.
+
+        `urls` may be a plain or async iterable and is consumed lazily, so new URLs
+        can be produced while earlier ones are still downloading.
+        """
+        if hasattr(urls, "__aiter__"):
+            source = urls.__aiter__()
+            next_url = source.__anext__
+        else:
+            source = iter(urls)
+
+            async def next_url():
+                try:
+                    return next(source)
+                except StopIteration:
+                    raise StopAsyncIteration
+
+        pending = set()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self.concurrency:
+                    try:
+                        url = await next_url()
+                    except StopAsyncIteration:
+                        exhausted = True
+                    else:
+                        pending.add(asyncio.ensure_future(self._fetch(url, method, kwargs)))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
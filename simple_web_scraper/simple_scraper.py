@@ -1,16 +1,49 @@
+import argparse
 import requests
 from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from http_cache import HttpCache, OFFLINE_MISS, REVALIDATE, SERVE
+from http_client import HttpClient
+
+# lxml is much faster than the stdlib parser; fall back to html.parser when it isn't installed
+PARSER = "lxml" if builder_registry.lookup("lxml") else "html.parser"
+
+CACHE_DIR = ".http_cache"
 
 # Step 1: Choose a target URL
 url = "https://books.toscrape.com"
 
-def fetch_url(url, method='GET', session=None, **kwargs):
-    """Function to make web requests and handle errors."""
+def cached_response(entry):
+    """Wraps a cache entry in a requests.Response so callers can't tell the difference."""
+    response = requests.Response()
+    response.status_code = entry.status
+    response.headers.update(entry.headers)
+    response._content = entry.body
+    response.url = entry.url
+    return response
+
+def fetch_url(url, method='GET', session=None, cache=None, **kwargs):
+    """Function to make web requests and handle errors.
+
+    With an HttpCache, GET responses are served from disk while fresh and revalidated
+    with conditional headers once stale.
+    """
     try:
+        entry, action = None, None
+        if cache is not None and method == 'GET':
+            url = requests.Request('GET', url, params=kwargs.pop('params', None)).prepare().url
+            entry, action = cache.plan('GET', url, kwargs.get('headers'))
+            if action == SERVE:
+                logging.info(f"Served {url} from cache.")
+                return cached_response(entry)
+            if action == OFFLINE_MISS:
+                logging.error(f"Offline mode: {url} is not in the cache.")
+                return None
+            if action == REVALIDATE:
+                kwargs['headers'] = {**(kwargs.get('headers') or {}), **entry.validators()}
+
         if session:
             request_func = session.get if method == 'GET' else session.post
         else:
@@ -18,6 +51,11 @@ def fetch_url(url, method='GET', session=None, **kwargs):
 
         response = request_func(url, **kwargs)
         response.raise_for_status()
+        if action is not None:
+            entry = cache.update('GET', url, entry, action, response.status_code, response.headers, response.content)
+            if entry is not None:
+                logging.info(f"Revalidated {url} from cache.")
+                return cached_response(entry)
         logging.info(f"Request to {url} succeeded.")
         return response
     except requests.exceptions.HTTPError as err:
@@ -28,89 +66,107 @@ def fetch_url(url, method='GET', session=None, **kwargs):
         logging.error(f"Request error occurred: {err}")
     return None
 
-# Direct request without session
-response = fetch_url(url, timeout=5)
-
-# Using a session
-with requests.Session() as session:
-    session.headers.update({'User-Agent': 'Mozilla/5.0'})
-    session_response = fetch_url(url, session=session, timeout=5)
-
-# Handle authentication (optional test)
-auth_url = "https://httpbin.org/basic-auth/user/passwd"
-auth_response = fetch_url(auth_url, auth=('user', 'passwd'), timeout=5)
-
-# Stream Downloads
-stream_response = fetch_url("https://books.toscrape.com/static/images/banner.jpg", stream=True)
-if stream_response:
-    with open("banner.jpg", 'wb') as f:
-        for chunk in stream_response.iter_content(chunk_size=8192):
-            f.write(chunk)
-
-# GET with query params
-params = {'category': 'fiction', 'sort': 'price'}
-response_with_params = fetch_url("https://books.toscrape.com/catalogue/category/books/fiction_10/index.html", params=params)
-
-# Custom headers
-headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
-response_headers = fetch_url("https://books.toscrape.com/", headers=headers)
-
-# POST example
-post_data = {"username": "test", "password": "1234"}
-post_response = fetch_url("https://httpbin.org/post", method='POST', data=post_data)
-
-# HEAD request for checking headers
-head_response = fetch_url("https://books.toscrape.com/", method='HEAD')
-
-# Handling redirects
-redirect_response = fetch_url("http://books.toscrape.com")
-non_redirect_response = fetch_url("http://books.toscrape.com", allow_redirects=False)
-
-# Always use a browser-like User-Agent
-headers = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-}
-
-# Step 1: Download the page
-response = requests.get(url, headers=headers)
-
-# Step 2: Parse the HTML
-soup = BeautifulSoup(response.text, 'html.parser')
-
-# Ensure response and soup are correctly initialized
-response = fetch_url("https://books.toscrape.com")
-if response:
-    soup = BeautifulSoup(response.text, 'html.parser')
-
-# Step 3: Find all book titles (they're inside <h3> tags with <a> inside them)
-for h3 in soup.find_all('h3'):
-        a_tag = h3.find('a') # type: ignore
-        if a_tag and 'title' in a_tag.attrs: # type: ignore
-            title = a_tag['title']  # type: ignore # The book title is stored in the 'title' attribute
-            print(title)
-        else:
-            logging.warning("No title found in h3 element.")
-    
-
-# Always use a browser-like User-Agent
-headers = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-}
-
-# Step 1: Download the page
-response = requests.get(url, headers=headers)
-
-# Step 2: Parse the HTML
-soup = BeautifulSoup(response.text, 'html.parser')
-
-# Step 3: Find all book titles (they're inside <h3> tags with <a> inside them)
-for h3 in soup.find_all('h3'):
-    title = h3.find('a')['title']  # The book title is stored in the 'title' attribute
-    print(title)
-
-
-
-
-
- 
-
+def request_examples(cache=None):
+    # Direct request without session
+    response = fetch_url(url, timeout=5, cache=cache)
+
+    # Using a session
+    with requests.Session() as session:
+        session.headers.update({'User-Agent': 'Mozilla/5.0'})
+        session_response = fetch_url(url, session=session, timeout=5, cache=cache)
+
+    # GET with query params
+    params = {'category': 'fiction', 'sort': 'price'}
+    response_with_params = fetch_url("https://books.toscrape.com/catalogue/category/books/fiction_10/index.html", params=params, cache=cache)
+
+    # Custom headers
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
+    response_headers = fetch_url("https://books.toscrape.com/", headers=headers, cache=cache)
+
+    # Handling redirects
+    redirect_response = fetch_url("http://books.toscrape.com", cache=cache)
+
+    if cache is not None and cache.offline:
+        logging.info("Offline mode: skipping the auth, stream, POST, HEAD and no-redirect examples; "
+                     "they always go to the network.")
+    else:
+        uncached_examples()
+
+    # Many URLs over pooled keep-alive connections, with retries and bounded concurrency
+    pages = [f"https://books.toscrape.com/catalogue/page-{n}.html" for n in range(1, 6)]
+    with HttpClient(concurrency=5, cache=cache) as client:
+        for result in client.fetch_many(pages):
+            if result.ok:
+                logging.info(f"{result.url}: {len(result.response.content)} bytes")
+
+def uncached_examples():
+    # Requests the cache does not store (only plain GETs are cached)
+
+    # Handle authentication (optional test)
+    auth_url = "https://httpbin.org/basic-auth/user/passwd"
+    auth_response = fetch_url(auth_url, auth=('user', 'passwd'), timeout=5)
+
+    # Stream Downloads
+    stream_response = fetch_url("https://books.toscrape.com/static/images/banner.jpg", stream=True)
+    if stream_response:
+        with open("banner.jpg", 'wb') as f:
+            for chunk in stream_response.iter_content(chunk_size=8192):
+                f.write(chunk)
+
+    # POST example
+    post_data = {"username": "test", "password": "1234"}
+    post_response = fetch_url("https://httpbin.org/post", method='POST', data=post_data)
+
+    # HEAD request for checking headers
+    head_response = fetch_url("https://books.toscrape.com/", method='HEAD')
+
+    # Handling redirects
+    non_redirect_response = fetch_url("http://books.toscrape.com", allow_redirects=False)
+
+def print_book_titles(cache=None):
+    # First page only; book_catalogue.py scrapes the whole catalogue
+
+    # Always use a browser-like User-Agent
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    }
+
+    # Step 1: Download the page
+    response = fetch_url(url, headers=headers, cache=cache)
+    if not response:
+        return
+
+    # Step 2: Parse the HTML
+    soup = BeautifulSoup(response.text, PARSER)
+
+    # Step 3: Find all book titles (they're inside <h3> tags with <a> inside them)
+    for h3 in soup.find_all('h3'):
+            a_tag = h3.find('a') # type: ignore
+            if a_tag and 'title' in a_tag.attrs: # type: ignore
+                title = a_tag['title']  # type: ignore # The book title is stored in the 'title' attribute
+                print(title)
+            else:
+                logging.warning("No title found in h3 element.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Requests/BeautifulSoup scraping examples against books.toscrape.com.")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help=f"HTTP cache directory (default {CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Always go to the network")
+    parser.add_argument("--offline", action="store_true", help="Replay responses from the cache only")
+    args = parser.parse_args(argv)
+    if args.offline and args.no_cache:
+        parser.error("--offline replays the cache; it cannot be combined with --no-cache")
+
+    # Configure logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    cache = None if args.no_cache else HttpCache(args.cache_dir, offline=args.offline)
+    request_examples(cache)
+    print_book_titles(cache)
+    if cache:
+        logging.info(f"Cache: {cache.stats()}")
+        cache.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The scripts import their neighbours by bare name, as they do when run from their own directory
+for directory in ("tutorialsdojo_scripts", "transcription_tools", "simple_web_scraper"):
+    path = os.path.join(REPO_DIR, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
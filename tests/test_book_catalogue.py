@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("bs4")
+httpx = pytest.importorskip("httpx")
+
+import book_catalogue  # noqa: E402
+from http_client import AsyncHttpClient  # noqa: E402
+
+BASE = "https://books.toscrape.com/catalogue/"
+LISTING = """<article class="product_pod"><h3><a href="book-{n}/index.html">Book</a></h3></article>
+<ul class="pager"><li class="next"><a href="page-2.html">next</a></li></ul>"""
+BOOK = """<div class="product_main"><h1>Book {n}</h1><p class="price_color">£1.00</p>
+<p class="availability">In stock</p><p class="star-rating Three"></p></div>
+<table class="table"><tr><th>UPC</th><td>upc-{n}</td></tr></table>"""
+
+
+def handler(request):
+    path = request.url.path
+    if path.endswith("page-1.html"):
+        return httpx.Response(200, text=LISTING.format(n=1))
+    if path.endswith("page-2.html"):
+        return httpx.Response(404)
+    return httpx.Response(200, text=BOOK.format(n=path.split("/")[-2]))
+
+
+async def scrape(stats):
+    async with AsyncHttpClient(retries=0, transport=httpx.MockTransport(handler)) as client:
+        return [record async for record in book_catalogue.scrape_catalogue(client, BASE + "page-1.html", stats)]
+
+
+def test_failed_listing_page_stops_pagination_cleanly():
+    stats = book_catalogue.Stats()
+    records = asyncio.run(scrape(stats))
+    assert [record["upc"] for record in records] == ["upc-book-1"]
+    assert stats.listing_pages == 1
+    assert stats.errors == 1
+
+
+def test_concurrency_below_one_is_rejected(tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        book_catalogue.main([str(tmp_path / "books.jsonl"), "--concurrency", "0"])
+    assert exit_info.value.code == 2
+    assert not (tmp_path / "books.jsonl").exists()
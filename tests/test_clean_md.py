@@ -0,0 +1,17 @@
+import json
+
+import clean_md
+
+
+def test_unchanged_files_are_skipped_on_rerun(tmp_path, capsys):
+    source, output = tmp_path / "raw", tmp_path / "clean"
+    source.mkdir()
+    (source / "amazon-s3.md").write_text("# Amazon S3\n\nObjects live in buckets.\n", encoding="utf-8")
+
+    clean_md.clean_dir(str(source), str(output), jobs=1)
+    manifest = json.loads((output / clean_md.MANIFEST_FILE).read_text(encoding="utf-8"))
+    assert list(manifest) == ["amazon-s3.md"]
+
+    capsys.readouterr()
+    clean_md.clean_dir(str(source), str(output), jobs=1)
+    assert "1 unchanged" in capsys.readouterr().out
@@ -0,0 +1,26 @@
+import pytest
+
+from jdr_tools import cli
+
+
+@pytest.mark.parametrize("command", [None, *cli.COMMANDS])
+def test_help_is_fast_and_loads_no_backend(command):
+    argv = ["--help"] if command is None else [command, "--help"]
+    seconds, imported, error = cli.time_help(argv, cli.STARTUP_REPEAT)
+    if error and error.startswith("ModuleNotFoundError"):
+        pytest.skip(f"extras for {command} are not installed: {error}")
+    assert error is None
+    assert imported == []
+    assert seconds <= cli.STARTUP_BUDGET_SECONDS
+
+
+def test_unknown_command_is_a_usage_error(capsys):
+    assert cli.main(["nope"]) == 2
+    assert "unknown command 'nope'" in capsys.readouterr().err
+
+
+def test_missing_script_directory_is_reported(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(cli, "PACKAGE_DIR", str(tmp_path))
+    monkeypatch.setattr(cli, "REPO_DIR", str(tmp_path))
+    assert cli.main(["clean", "--help"]) == 1
+    assert "reinstall" in capsys.readouterr().err
@@ -0,0 +1,46 @@
+import dedupe_md
+
+PROMO = ("Get 20% off our AWS practice exams this week only, use the coupon code at checkout "
+         "and start preparing for your certification today.")
+CODE = "```\naws configure\n\naws s3api get-bucket-{n} --bucket example\n```"
+
+
+def sheet(n):
+    return "\n\n".join([
+        f"# Service {n}",
+        f"Service {n} stores objects number {n} in buckets and serves them over a regional endpoint {n} times.",
+        CODE.format(n=n),
+        "- Yes",
+        PROMO,
+    ]) + "\n"
+
+
+def test_fenced_code_is_one_block():
+    blocks = dedupe_md.split_blocks(sheet(1))
+    assert CODE.format(n=1) in blocks
+    assert len(blocks) == 5
+
+
+def test_only_repeated_prose_is_removed():
+    blocks_by_file = {f"s{n}.md": dedupe_md.split_blocks(sheet(n)) for n in range(6)}
+    removed, report = dedupe_md.find_boilerplate(blocks_by_file, min_files=5)
+    assert len(report) == 1 and report[0]["files"] == 6
+
+    for n, blocks in enumerate(blocks_by_file.values()):
+        kept, dropped, _ = dedupe_md.strip_blocks(blocks, removed)
+        assert PROMO not in kept
+        assert sum(dropped.values()) == 1
+        assert CODE.format(n=n) in kept
+        assert "- Yes" in kept
+        assert any(block.startswith(f"Service {n} stores") for block in kept)
+
+
+def test_dedupe_dir_keeps_code_fences_balanced(tmp_path):
+    for n in range(6):
+        (tmp_path / f"s{n}.md").write_text(sheet(n), encoding="utf-8")
+    dedupe_md.dedupe_dir(str(tmp_path), report_path=str(tmp_path / "report.csv"))
+    for n in range(6):
+        text = (tmp_path / f"s{n}.md").read_text(encoding="utf-8")
+        assert PROMO not in text
+        assert CODE.format(n=n) in text
+        assert text.count("```") == 2
@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from http_cache import CachingTransport, HttpCache  # noqa: E402
+
+URL = "https://books.toscrape.com/index.html"
+
+
+class Server:
+    """MockTransport handler that counts requests and answers If-None-Match with 304."""
+
+    def __init__(self, cache_control="max-age=0", body=b"<html>books</html>"):
+        self.cache_control = cache_control
+        self.body = body
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        headers = {"ETag": '"v1"', "Cache-Control": self.cache_control}
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, headers=headers, content=self.body)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    yield cache
+    cache.close()
+
+
+def client_for(cache, server):
+    return httpx.Client(transport=CachingTransport(cache, httpx.MockTransport(server)))
+
+
+def test_fresh_entry_is_served_without_a_request(cache):
+    server = Server(cache_control="max-age=60")
+    with client_for(cache, server) as client:
+        client.get(URL)
+        response = client.get(URL)
+    assert len(server.requests) == 1
+    assert response.extensions.get("from_cache")
+    assert response.content == server.body
+    assert cache.stats()["hits"] == 1
+
+
+def test_stale_entry_is_revalidated_and_served_from_disk(cache):
+    server = Server()
+    with client_for(cache, server) as client:
+        client.get(URL)
+        response = client.get(URL)
+    assert server.requests[1].headers["if-none-match"] == '"v1"'
+    assert response.status_code == 200
+    assert response.content == server.body
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_caller_validators_get_the_raw_304(cache):
+    server = Server()
+    with client_for(cache, server) as client:
+        client.get(URL)
+        response = client.get(URL, headers={"If-None-Match": '"v1"'})
+    assert response.status_code == 304
+    assert cache.stats()["revalidated"] == 0
+    # The stored body is kept for later plain requests
+    assert cache.get("GET", URL).body == server.body
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=250)
+    try:
+        for name in ("a", "b"):
+            cache.put("GET", f"https://example.com/{name}", 200, {}, b"x" * 100)
+            time.sleep(0.01)
+        cache.get("GET", "https://example.com/a")  # a is now more recent than b
+        time.sleep(0.01)
+        cache.put("GET", "https://example.com/c", 200, {}, b"x" * 100)
+
+        assert cache.get("GET", "https://example.com/b") is None
+        assert cache.get("GET", "https://example.com/a") is not None
+        assert cache.get("GET", "https://example.com/c") is not None
+        assert cache._size == 200
+    finally:
+        cache.close()
+    # The running size matches what is on disk after a reopen
+    reopened = HttpCache(str(tmp_path), max_bytes=250)
+    assert reopened._size == 200
+    reopened.close()
@@ -0,0 +1,10 @@
+import md_to_pdf
+
+
+def test_book_from_empty_directory_does_not_run_pandoc(tmp_path, monkeypatch, capsys):
+    def no_pandoc(*args, **kwargs):
+        raise AssertionError("pandoc run with no input files")
+
+    monkeypatch.setattr(md_to_pdf, "run_pandoc", no_pandoc)
+    md_to_pdf.build_book(str(tmp_path), str(tmp_path / "pdf"))
+    assert "nothing to build" in capsys.readouterr().out
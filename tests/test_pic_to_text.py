@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+pytest.importorskip("pytesseract")
+
+import pic_to_text  # noqa: E402
+from PIL import Image  # noqa: E402
+
+
+def test_missing_input_is_reported_not_raised(tmp_path, capsys):
+    missing = str(tmp_path / "scna.png")  # mistyped
+    failed = pic_to_text.ocr_batch([missing], output_dir=str(tmp_path / "out"), jobs=1)
+    out = capsys.readouterr().out
+    assert f"Error reading {missing}" in out
+    assert failed == {os.path.abspath(missing)}
+
+
+def test_inputs_sharing_an_output_name_are_refused(tmp_path, capsys):
+    inputs = []
+    for directory in ("scans", "photos"):
+        (tmp_path / directory).mkdir()
+        inputs.append(str(tmp_path / directory / "a.png"))
+        Image.new("L", (8, 8), 255).save(inputs[-1])
+
+    failed = pic_to_text.ocr_batch(inputs, output_dir=str(tmp_path / "out"), jobs=1)
+    assert failed == {os.path.abspath(path) for path in inputs}
+    assert "would all be written to" in capsys.readouterr().out
+    assert not (tmp_path / "out" / "a.txt").exists()
+
+
+def test_patterns_matching_nothing_are_reported(tmp_path):
+    (tmp_path / "empty").mkdir()
+    (tmp_path / "notes.txt").write_text("not an image")
+    Image.new("L", (8, 8), 255).save(tmp_path / "a.png")
+    patterns = [str(tmp_path / "scan*.png"), str(tmp_path / "empty"), str(tmp_path / "*.png")]
+
+    files, unmatched = pic_to_text.expand_inputs(patterns)
+    assert files == [str(tmp_path / "a.png")]
+    assert unmatched == patterns[:2]
+
+
+def test_cli_fails_when_nothing_matches(tmp_path, capsys):
+    pattern = str(tmp_path / "scan*.png")
+    with pytest.raises(SystemExit) as exit_info:
+        pic_to_text.main([pattern, "--output-dir", str(tmp_path / "out")])
+    assert exit_info.value.code == 1
+    assert f"no images or PDFs match {pattern}" in capsys.readouterr().out
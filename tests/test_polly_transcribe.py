@@ -0,0 +1,33 @@
+import io
+import time
+
+import pytest
+
+import polly_transcribe
+from usage_ledger import UsageLedger
+
+
+class FlakyPolly:
+    """synthesize_speech that fails for one text, after the others have been sent."""
+
+    def __init__(self, failing_text):
+        self.failing_text = failing_text
+
+    def synthesize_speech(self, Text, OutputFormat, VoiceId):
+        if Text == self.failing_text:
+            time.sleep(0.2)
+            raise RuntimeError("throttled")
+        return {"AudioStream": io.BytesIO(b"mp3 frames")}
+
+
+def test_chunks_billed_before_a_failure_are_recorded(tmp_path):
+    paragraphs = ["First paragraph.", "Second paragraph.", "Third paragraph.", "Fourth paragraph."]
+    ledger = UsageLedger(str(tmp_path / "usage.sqlite"), legacy_log=str(tmp_path / "none.json"))
+    try:
+        with pytest.raises(RuntimeError):
+            polly_transcribe.synthesize_text("\n\n".join(paragraphs), str(tmp_path / "out.mp3"),
+                                             FlakyPolly(paragraphs[0]), jobs=4, ledger=ledger)
+        assert ledger.month_total() == sum(len(p) for p in paragraphs[1:])
+    finally:
+        ledger.close()
+    assert not (tmp_path / "out.mp3").exists()
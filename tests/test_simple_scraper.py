@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("httpx")
+requests = pytest.importorskip("requests")
+
+import simple_scraper  # noqa: E402
+from http_cache import HttpCache  # noqa: E402
+
+
+def test_offline_examples_never_touch_the_network(tmp_path, monkeypatch):
+    def no_network(*args, **kwargs):
+        raise AssertionError(f"network request in offline mode: {args}")
+
+    monkeypatch.setattr(requests, "get", no_network)
+    monkeypatch.setattr(requests, "post", no_network)
+    monkeypatch.setattr(requests.Session, "request", no_network)
+    cache = HttpCache(str(tmp_path), offline=True)
+    try:
+        simple_scraper.request_examples(cache)
+    finally:
+        cache.close()
@@ -0,0 +1,89 @@
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("httpx")
+
+import httpx  # noqa: E402
+import td_crawl  # noqa: E402
+from bs4.builder import builder_registry  # noqa: E402
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(td_crawl.__file__))
+
+
+@pytest.mark.parametrize("parser", td_crawl.PARSER_BACKENDS)
+def test_index_dump_yields_known_links(parser):
+    if not builder_registry.lookup(parser):
+        pytest.skip(f"{parser} is not installed")
+    with open(os.path.join(SCRIPTS_DIR, "index_page_dump.html"), encoding="utf-8") as f:
+        html = f.read()
+    # cheatsheet_urls.txt is what link discovery wrote from this same page
+    with open(os.path.join(SCRIPTS_DIR, "cheatsheet_urls.txt"), encoding="utf-8") as f:
+        expected = sorted({line.strip() for line in f if line.strip()})
+
+    assert td_crawl.parse_cheat_sheet_links(html, parser) == expected
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.waits = []
+
+    async def wait(self, url):
+        self.waits.append(url)
+
+
+class FailingClient:
+    async def get(self, url, headers=None):
+        raise httpx.ConnectError("refused")
+
+
+class EmptyBrowser:
+    async def render(self, url):
+        return "<html></html>", {}
+
+
+class NoState:
+    def get(self, url):
+        return None
+
+    def record(self, url, status, **fields):
+        pass
+
+
+@pytest.mark.parametrize("http_first, requests", [(True, 2), (False, 1)])
+def test_browser_fallback_waits_for_host_slot(http_first, requests):
+    limiter = RecordingLimiter()
+    url = "https://tutorialsdojo.com/amazon-s3/"
+    asyncio.run(td_crawl.scrape_page(FailingClient(), EmptyBrowser(), url, limiter, NoState(), False, http_first))
+    assert limiter.waits == [url] * requests
+
+
+class KnownState(NoState):
+    def __init__(self, entry):
+        self.entry = entry
+
+    def get(self, url):
+        return self.entry
+
+
+class RecordingClient:
+    def __init__(self):
+        self.headers = []
+
+    async def get(self, url, headers=None):
+        self.headers.append(headers)
+        return httpx.Response(304, request=httpx.Request("GET", url))
+
+
+@pytest.mark.parametrize("saved, conditional", [(True, True), (False, False)])
+def test_revalidates_only_while_the_saved_page_exists(tmp_path, saved, conditional):
+    filepath = tmp_path / "amazon-s3.md"
+    if saved:
+        filepath.write_text("# Amazon S3\n", encoding="utf-8")
+    state = KnownState({"status": "ok", "etag": '"v1"', "filepath": str(filepath)})
+    client = RecordingClient()
+    asyncio.run(td_crawl.scrape_page(client, EmptyBrowser(), "https://tutorialsdojo.com/amazon-s3/",
+                                     RecordingLimiter(), state, False, True))
+    assert bool(client.headers[0]) == conditional
@@ -0,0 +1,80 @@
+# Compare transcription backends on a fixture recording
+#
+#   python bench_backends.py interview_clip.mp3
+#   python bench_backends.py interview_clip.mp3 --model base.en --seconds 120 --compute-type int8 float32
+#
+# Reports load time, real-time factor (processing seconds per second of audio, lower is
+# faster) and how many words each backend agrees on with the first one.
+
+import argparse
+import difflib
+import re
+import time
+
+from transcribe_audio import (BACKENDS, DEFAULT_COMPUTE_TYPE, MODEL_NAME, SAMPLE_RATE,
+                              load_audio, load_backend)
+
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def words(text):
+    return WORD_RE.findall(text.lower())
+
+
+def word_agreement(reference, hypothesis):
+    """Fraction of reference words that line up with the hypothesis, ignoring case and punctuation."""
+    if not reference:
+        return 1.0 if not hypothesis else 0.0
+    matcher = difflib.SequenceMatcher(None, reference, hypothesis, autojunk=False)
+    return sum(block.size for block in matcher.get_matching_blocks()) / len(reference)
+
+
+def run_backend(name, model_name, compute_type, audio):
+    started = time.perf_counter()
+    model = load_backend(name, model_name, compute_type=compute_type)
+    loaded = time.perf_counter()
+    segments = list(model.transcribe(audio))  # backends decode lazily
+    finished = time.perf_counter()
+    text = "".join(segment["text"] for segment in segments)
+    return loaded - started, finished - loaded, text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark transcription backends on one audio file.")
+    parser.add_argument("audio", help="Fixture audio file (anything ffmpeg can read)")
+    parser.add_argument("--model", default=MODEL_NAME, help=f"Model size for every backend (default {MODEL_NAME})")
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=sorted(BACKENDS),
+                        help="Backends to compare; the first is the reference (default: all)")
+    parser.add_argument("--compute-type", nargs="+", default=[DEFAULT_COMPUTE_TYPE],
+                        help=f"faster-whisper compute types to try (default {DEFAULT_COMPUTE_TYPE})")
+    parser.add_argument("--seconds", type=float, help="Only use the first N seconds of the file")
+    args = parser.parse_args(argv)
+
+    audio = load_audio(args.audio)
+    if args.seconds:
+        audio = audio[:int(args.seconds * SAMPLE_RATE)]
+    duration = len(audio) / SAMPLE_RATE
+    print(f"{args.audio}: {duration:.1f}s of audio, model {args.model}")
+
+    runs = []
+    for name in args.backends:
+        # Quantisation only applies to faster-whisper; the PyTorch model runs once
+        for compute_type in args.compute_type if name == "faster-whisper" else [None]:
+            label = f"{name} ({compute_type})" if compute_type else name
+            try:
+                runs.append((label, *run_backend(name, args.model, compute_type, audio)))
+            except ImportError as e:
+                print(f"{label}: not installed, skipped ({e})")
+
+    if not runs:
+        return
+    reference = words(runs[0][3])
+    print(f"\n{'backend':<24} {'load':>7} {'transcribe':>11} {'RTF':>6} {'words':>6} {'agreement':>10}")
+    for label, load_seconds, transcribe_seconds, text in runs:
+        hypothesis = words(text)
+        print(f"{label:<24} {load_seconds:6.1f}s {transcribe_seconds:10.1f}s {transcribe_seconds / duration:6.2f} "
+              f"{len(hypothesis):6d} {word_agreement(reference, hypothesis):10.1%}")
+
+
+if __name__ == "__main__":
+    main()
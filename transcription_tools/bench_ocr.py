@@ -0,0 +1,75 @@
+# Compare OCR time and accuracy with and without preprocessing on fixture images
+#
+#   python bench_ocr.py fixtures/*.png
+#   python bench_ocr.py screenshot.png scan.jpg --repeat 3
+#
+# Accuracy needs the expected text next to each image as <name>.gt.txt; without it
+# only timings are shown.
+
+import argparse
+import difflib
+import os
+import re
+import statistics
+import time
+
+import pytesseract
+from PIL import Image
+
+from pic_to_text import DEFAULT_LANG, PDF_DPI, preprocess
+
+WORD_RE = re.compile(r"\w+")
+
+
+def word_accuracy(expected, actual):
+    """Fraction of expected words that tesseract got, in order, ignoring case and punctuation."""
+    expected, actual = WORD_RE.findall(expected.lower()), WORD_RE.findall(actual.lower())
+    if not expected:
+        return 1.0 if not actual else 0.0
+    matcher = difflib.SequenceMatcher(None, expected, actual, autojunk=False)
+    return sum(block.size for block in matcher.get_matching_blocks()) / len(expected)
+
+
+def timed(repeat, func, *args, **kwargs):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings.append(time.perf_counter() - started)
+    return result, statistics.median(timings)
+
+
+def bench_image(path, repeat, lang, dpi):
+    ground_truth_path = os.path.splitext(path)[0] + ".gt.txt"
+    expected = None
+    if os.path.exists(ground_truth_path):
+        with open(ground_truth_path, encoding="utf-8") as f:
+            expected = f.read()
+
+    with Image.open(path) as image:
+        image.load()
+        cleaned, prep_seconds = timed(repeat, preprocess, image, dpi)
+        rows = [("raw", image, 0.0), ("preprocessed", cleaned, prep_seconds)]
+        print(f"\n{path} ({image.width}x{image.height} {image.mode}, median of {repeat})")
+        print(f"{'input':<14} {'prep':>8} {'ocr':>8} {'total':>8} {'accuracy':>9}")
+        for label, candidate, prep in rows:
+            text, ocr_seconds = timed(repeat, pytesseract.image_to_string, candidate, lang=lang)
+            accuracy = f"{word_accuracy(expected, text):9.1%}" if expected is not None else f"{'-':>9}"
+            print(f"{label:<14} {prep * 1000:6.0f}ms {ocr_seconds * 1000:6.0f}ms "
+                  f"{(prep + ocr_seconds) * 1000:6.0f}ms {accuracy}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tesseract with and without preprocessing.")
+    parser.add_argument("images", nargs="+", help="Fixture images; <name>.gt.txt beside each holds the expected text")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (default 3)")
+    parser.add_argument("--lang", default=DEFAULT_LANG, help=f"Tesseract languages (default {DEFAULT_LANG})")
+    parser.add_argument("--dpi", type=int, default=PDF_DPI, help=f"Target DPI for preprocessing (default {PDF_DPI})")
+    args = parser.parse_args(argv)
+
+    for path in args.images:
+        bench_image(path, args.repeat, args.lang, args.dpi)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,17 @@
 from PIL import Image
-import pytesseract
 import argparse
+import numpy as np
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# The manifest helpers are shared with the cheat sheet scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "tutorialsdojo_scripts"))
+from md_to_pdf import load_manifest, save_manifest  # noqa: E402
 
 # install tesseract-ocr
 # uses Tesseract and a python wrapper
@@ -12,19 +23,281 @@ import argparse
 # pytesseract.image_to_string(image, lang='eng+fra')
 # Use pdf2image or PyMuPDF to convert pages to images, then OCR.
 
+# USAGE
+# python pic_to_text.py screenshot.png                 # -> ./screenshot.txt
+# python pic_to_text.py scans/ "photos/*.jpg" book.pdf --output-dir ocr --jobs 8
+# python pic_to_text.py screenshot.png --preprocess --format json    # -> ./screenshot.json
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".gif", ".webp")
+PDF_EXTENSIONS = (".pdf",)
+MANIFEST_FILE = ".ocr_manifest.json"
+DEFAULT_LANG = "eng"
+PDF_DPI = 300  # tesseract is tuned for ~300 DPI text
+PAGE_SEPARATOR = "\f"  # what tesseract itself puts between pages
+OUTPUT_FORMATS = ("text", "json")
+
+# Preprocessing
+GRAY_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)  # ITU-R 601 luma, same as PIL's "L"
+THRESHOLD_BLOCK = 31  # pixels; odd, roughly a few character heights at 300 DPI
+THRESHOLD_OFFSET = 10  # how much darker than its neighbourhood a pixel must be to count as ink
+MAX_SKEW_DEGREES = 5
+SKEW_STEP_DEGREES = 0.25
+SKEW_SAMPLE_PIXELS = 1000  # skew is estimated on a thumbnail this wide
+
+def pdf_renderer():
+  # PyMuPDF renders PDFs in-process; pdf2image needs poppler installed but is a fine fallback.
+  # Imported on first use so image-only runs (and --help) never pay for it.
+  try:
+    import fitz  # pip install pymupdf
+  except ImportError:
+    return None
+  return fitz
+
+def page_count(path):
+  if not path.lower().endswith(PDF_EXTENSIONS):
+    return 1
+  fitz = pdf_renderer()
+  if fitz:
+    with fitz.open(path) as doc:
+      return doc.page_count
+  from pdf2image import pdfinfo_from_path  # pip install pdf2image
+  return pdfinfo_from_path(path)["Pages"]
+
+def load_page(path, page, dpi=PDF_DPI):
+  """Returns one page of the input as a PIL image: the image itself, or a rendered PDF page."""
+  if not path.lower().endswith(PDF_EXTENSIONS):
+    return Image.open(path)
+  fitz = pdf_renderer()
+  if fitz:
+    with fitz.open(path) as doc:
+      pixmap = doc[page].get_pixmap(dpi=dpi)
+      return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+  from pdf2image import convert_from_path  # pip install pdf2image
+  return convert_from_path(path, dpi=dpi, first_page=page + 1, last_page=page + 1)[0]
+
+def grayscale(image):
+  pixels = np.asarray(image.convert("RGB"), dtype=np.float32)
+  return pixels @ GRAY_WEIGHTS
+
+def downscale(gray, source_dpi, target_dpi):
+  """Shrinks scans made above target_dpi; tesseract gains nothing from the extra pixels but time."""
+  if not source_dpi or source_dpi <= target_dpi:
+    return gray
+  scale = target_dpi / source_dpi
+  size = (max(1, round(gray.shape[1] * scale)), max(1, round(gray.shape[0] * scale)))
+  return np.asarray(Image.fromarray(gray).resize(size, Image.LANCZOS), dtype=np.float32)
+
+def adaptive_threshold(gray, block=THRESHOLD_BLOCK, offset=THRESHOLD_OFFSET):
+  """Black where a pixel is darker than the mean of its block x block neighbourhood by `offset`, white elsewhere.
+
+  Local means come from a summed-area table, so the cost does not depend on the block size.
+  """
+  half = block // 2
+  padded = np.pad(gray, half + 1, mode="edge")
+  table = padded.cumsum(axis=0, dtype=np.float64).cumsum(axis=1)
+  h, w = gray.shape
+  window = (table[block:block + h, block:block + w] - table[:h, block:block + w]
+            - table[block:block + h, :w] + table[:h, :w])
+  local_mean = window / (block * block)
+  return np.where(gray < local_mean - offset, 0, 255).astype(np.uint8)
+
+def skew_angle(binary):
+  """Angle that makes text lines horizontal: the one whose row ink profile is sharpest."""
+  thumb = Image.fromarray(binary)
+  if thumb.width > SKEW_SAMPLE_PIXELS:
+    thumb = thumb.resize((SKEW_SAMPLE_PIXELS, max(1, thumb.height * SKEW_SAMPLE_PIXELS // thumb.width)))
+  ink = Image.fromarray((np.asarray(thumb) < 128).astype(np.uint8) * 255)
+  best_angle, best_score = 0.0, -1.0
+  for angle in np.arange(-MAX_SKEW_DEGREES, MAX_SKEW_DEGREES + SKEW_STEP_DEGREES, SKEW_STEP_DEGREES):
+    rows = np.asarray(ink.rotate(angle, resample=Image.NEAREST), dtype=np.float32).sum(axis=1)
+    score = float(np.square(np.diff(rows)).sum())
+    if score > best_score:
+      best_angle, best_score = float(angle), score
+  return best_angle
+
+def preprocess(image, target_dpi=PDF_DPI, source_dpi=None):
+  """Grayscale, downscale to target_dpi, adaptive threshold and deskew. Returns a black-and-white PIL image."""
+  source_dpi = source_dpi or (image.info.get("dpi") or (None,))[0]
+  gray = downscale(grayscale(image), source_dpi, target_dpi)
+  binary = adaptive_threshold(gray)
+  angle = skew_angle(binary)
+  cleaned = Image.fromarray(binary)
+  if angle:
+    cleaned = cleaned.rotate(angle, resample=Image.BILINEAR, expand=True, fillcolor=255)
+  return cleaned
+
+def words_from_data(data):
+  """Word boxes and confidences from image_to_data, without the empty layout rows."""
+  words = []
+  for i, text in enumerate(data["text"]):
+    conf = float(data["conf"][i])
+    if conf < 0 or not text.strip():
+      continue
+    words.append({"text": text, "conf": round(conf, 1),
+                  "left": data["left"][i], "top": data["top"][i],
+                  "width": data["width"][i], "height": data["height"][i],
+                  "block": data["block_num"][i], "line": data["line_num"][i]})
+  return words
+
+def init_worker():
+  # One tesseract per core: stop each one from spreading over every core with OpenMP
+  os.environ["OMP_THREAD_LIMIT"] = "1"
+
+def ocr_page(path, page, lang=DEFAULT_LANG, dpi=PDF_DPI, clean=False, output_format="text"):
+  """OCRs one page. Returns (path, page, text or list of words, seconds)."""
+  import pytesseract
+
+  started = time.perf_counter()
+  with load_page(path, page, dpi) as image:
+    # PDF pages were just rendered at `dpi`; images carry their own DPI, if any
+    if clean:
+      image = preprocess(image, dpi, dpi if path.lower().endswith(PDF_EXTENSIONS) else None)
+    # Extract Text
+    if output_format == "json":
+      result = words_from_data(pytesseract.image_to_data(image, lang=lang, output_type=pytesseract.Output.DICT))
+    else:
+      result = pytesseract.image_to_string(image, lang=lang)
+  return path, page, result, time.perf_counter() - started
+
+def expand_inputs(patterns):
+  """Files named directly, every supported file in a named directory, or glob matches, in a stable order.
+
+  Returns (files, patterns): the second lists directories and globs that matched no supported file.
+  """
+  supported = IMAGE_EXTENSIONS + PDF_EXTENSIONS
+  found = []
+  unmatched = []
+  for pattern in patterns:
+    if os.path.isdir(pattern):
+      matches = sorted(os.path.join(pattern, f) for f in os.listdir(pattern) if f.lower().endswith(supported))
+    elif glob.has_magic(pattern):
+      matches = sorted(p for p in glob.glob(pattern) if p.lower().endswith(supported))
+    else:
+      matches = [pattern]  # a missing file is reported when it is read
+    if not matches:
+      unmatched.append(pattern)
+    found.extend(matches)
+  return list(dict.fromkeys(found)), unmatched
+
+def input_hash(path, settings):
+  """Hash of the file contents and the OCR settings, so changing either forces a rerun."""
+  digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8"))
+  with open(path, "rb") as f:
+    for block in iter(lambda: f.read(1 << 16), b""):
+      digest.update(block)
+  return digest.hexdigest()
+
+def output_path(path, output_dir, output_format="text"):
+  extension = ".json" if output_format == "json" else ".txt"
+  return os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + extension)
+
+def write_output(path, output_dir, pages, output_format="text"):
+  with open(output_path(path, output_dir, output_format), "w", encoding="utf-8") as f:
+    if output_format == "json":
+      json.dump({"source": path, "pages": [{"page": i, "words": words} for i, words in enumerate(pages, 1)]},
+                f, ensure_ascii=False, indent=1)
+    else:
+      f.write(PAGE_SEPARATOR.join(pages))
+
+def ocr_batch(inputs, output_dir=".", jobs=None, lang=DEFAULT_LANG, dpi=PDF_DPI, force=False,
+              clean=False, output_format="text"):
+  """OCRs every page of every input across a process pool and writes one .txt (or .json) per input.
+
+  Inputs whose hash matches the manifest from the previous run are skipped. Inputs that would
+  write the same output file (scans/a.png and photos/a.jpg both make a.txt) are refused, as are
+  unreadable ones. Returns the absolute paths of the inputs that failed.
+  """
+  import pytesseract
+
+  started = time.monotonic()
+  os.makedirs(output_dir, exist_ok=True)
+  manifest = load_manifest(output_dir, MANIFEST_FILE)
+  settings = {"lang": lang, "dpi": dpi, "preprocess": clean, "format": output_format}
+
+  pending = {}
+  skipped = 0
+  failed = set()
+  by_output = {}
+  for path in inputs:
+    by_output.setdefault(output_path(path, output_dir, output_format), set()).add(os.path.abspath(path))
+  for target, sources in by_output.items():
+    if len(sources) > 1:
+      # One would silently overwrite the other, and the manifest would then call both done
+      print(f"Error: {', '.join(sorted(sources))} would all be written to {target}; "
+            f"OCR them into different --output-dir directories.")
+      failed.update(sources)
+
+  for path in inputs:
+    key = os.path.abspath(path)
+    if key in failed:
+      continue
+    try:
+      digest = input_hash(path, settings)
+      if not force and manifest.get(key) == digest and os.path.exists(output_path(path, output_dir, output_format)):
+        skipped += 1
+        continue
+      pending[path] = (key, digest, [None] * page_count(path))
+    except OSError as e:
+      # A mistyped or vanished file must not sink the rest of the batch
+      print(f"Error reading {path}: {e}")
+      failed.add(key)
 
+  total_pages = sum(len(pages) for _, _, pages in pending.values())
+  print(f"{len(pending)} inputs ({total_pages} pages) to OCR, {skipped} unchanged, using {jobs or os.cpu_count()} processes.")
+  ocr_seconds = 0.0
+  with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker) as pool:
+    futures = {pool.submit(ocr_page, path, page, lang, dpi, clean, output_format): (path, page)
+               for path, (_, _, pages) in pending.items() for page in range(len(pages))}
+    for future in as_completed(futures):
+      path, page = futures[future]
+      key, digest, pages = pending[path]
+      try:
+        _, _, result, seconds = future.result()
+      except (pytesseract.TesseractError, OSError) as e:
+        print(f"Error reading {path} page {page + 1}: {e}")
+        failed.add(key)
+        result, seconds = "", 0.0
+      pages[page] = result
+      ocr_seconds += seconds
+      print(f"{path} page {page + 1}/{len(pages)}: {seconds:.2f}s")
+      if key not in failed and all(p is not None for p in pages):
+        # Save
+        write_output(path, output_dir, pages, output_format)
+        manifest[key] = digest
+        save_manifest(output_dir, manifest, MANIFEST_FILE)
 
-# Import file from CLI
-parser = argparse.ArgumentParser()
-parser.add_argument("graphical_file", help = "Upload graphical file")
-args = parser.parse_args()
+  elapsed = time.monotonic() - started
+  per_page = f", {ocr_seconds / total_pages:.2f}s per page" if total_pages else ""
+  print(f"OCR'd {total_pages} pages from {sum(key not in failed for key, _, _ in pending.values())} inputs, skipped {skipped}, "
+        f"failed {len(failed)}, in {elapsed:.1f}s{per_page}.")
+  return failed
 
-# Load the image
-image = Image.open(args.graphical_file)
+def main(argv=None):
+  # Import file from CLI
+  parser = argparse.ArgumentParser(description="OCR images and PDFs with tesseract, one core per page.")
+  parser.add_argument("inputs", nargs="+", help="Images, PDFs, directories of them or glob patterns")
+  parser.add_argument("--output-dir", default=".", help="Where the .txt files go (default: current directory)")
+  parser.add_argument("--jobs", type=int, default=None, help="Tesseract processes (default: CPU count)")
+  parser.add_argument("--lang", default=DEFAULT_LANG, help=f"Tesseract languages, e.g. eng+fra (default {DEFAULT_LANG})")
+  parser.add_argument("--dpi", type=int, default=PDF_DPI, help=f"Resolution PDF pages are rendered at (default {PDF_DPI})")
+  parser.add_argument("--force", action="store_true", help="OCR even if the input is unchanged")
+  parser.add_argument("--preprocess", action="store_true",
+                      help="Grayscale, threshold, deskew and downscale to --dpi before OCR (helps noisy colour screenshots)")
+  parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text",
+                      help="text: plain .txt; json: word boxes and confidences per page (default text)")
+  args = parser.parse_args(argv)
+  if args.jobs is not None and args.jobs < 1:
+    parser.error("--jobs must be at least 1")
 
-# Extract Text
-text = pytesseract.image_to_string(image)
+  inputs, unmatched = expand_inputs(args.inputs)
+  for pattern in unmatched:
+    print(f"Error: no images or PDFs match {pattern}")
+  if not inputs:
+    sys.exit(1)
+  failed = ocr_batch(inputs, args.output_dir, args.jobs, args.lang, args.dpi, args.force,
+                     args.preprocess, args.format)
+  if unmatched or failed:
+    sys.exit(1)
 
-# Save
-with open("ocr_output.txt", "w", encoding="utf-8") as f:
-  f.write(text)
\ No newline at end of file
+if __name__ == "__main__":
+  main()
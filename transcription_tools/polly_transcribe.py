@@ -1,48 +1,145 @@
-import boto3
+import argparse
 import os
-import datetime
-import json
+import re
+import shutil
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tts_cache import CACHE_DIR, TtsCache
+from usage_ledger import LEDGER_FILE, STANDARD_FREE_TIER_LIMIT, UsageLedger, estimate_cost
 
 # Constants
 VOICE_ID = 'Joanna'
-USAGE_LOG_FILE = 'polly_usage_log.json'
-STANDARD_FREE_TIER_LIMIT = 5_000_000  # characters
-STANDARD_COST_PER_MILLION = 4.00  # USD
 CHAR_LIMIT = 3000  # Polly max input
-
-# Utility Functions
-def load_usage_log():
-    if os.path.exists(USAGE_LOG_FILE):
-        with open(USAGE_LOG_FILE, 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_usage_log(log):
-    with open(USAGE_LOG_FILE, 'w') as f:
-        json.dump(log, f, indent=2)
-
-def update_usage(log, chars_used):
-    now = datetime.datetime.utcnow()
-    key = f"{now.year}-{now.month:02}"
-    log[key] = log.get(key, 0) + chars_used
-    return log
-
-def estimate_cost(total_chars):
-    if total_chars <= STANDARD_FREE_TIER_LIMIT:
-        return 0.0
-    overage = total_chars - STANDARD_FREE_TIER_LIMIT
-    return (overage / 1_000_000) * STANDARD_COST_PER_MILLION
+DEFAULT_JOBS = 4  # concurrent synthesize_speech calls
+STREAM_BLOCK = 64 * 1024
+
+PARAGRAPH_RE = re.compile(r"\n\s*\n")
+SENTENCE_RE = re.compile(r"(?:(?<=[.!?;:])|(?<=[.!?;:][\"')\]]))\s+")
+
+# Text chunking
+def split_long(piece, limit):
+    """Splits a single over-long sentence on whitespace, or hard at `limit` if there is none."""
+    while len(piece) > limit:
+        cut = piece.rfind(" ", 0, limit + 1)
+        if cut <= 0:
+            cut = limit
+        yield piece[:cut].strip()
+        piece = piece[cut:].strip()
+    if piece:
+        yield piece
+
+def split_text(text, limit=CHAR_LIMIT):
+    """Splits text into chunks of at most `limit` characters, breaking between sentences.
+
+    Paragraphs never share a chunk, so editing one paragraph leaves every other chunk, and
+    its cache entry, unchanged.
+    """
+    chunks = []
+    for paragraph in PARAGRAPH_RE.split(text):
+        current = ""
+        for sentence in SENTENCE_RE.split(" ".join(paragraph.split())):
+            for piece in split_long(sentence, limit):
+                if current and len(current) + 1 + len(piece) > limit:
+                    chunks.append(current)
+                    current = ""
+                current += (" " if current else "") + piece
+        if current:
+            chunks.append(current)
+    return chunks
+
+# Synthesis
+def create_client(jobs=DEFAULT_JOBS):
+    import boto3  # slow to import; not needed for --help or a fully cached run
+    from botocore.config import Config
+
+    # One client shared by every thread; boto3 clients are thread-safe, the pool just needs enough connections
+    return boto3.client('polly', config=Config(max_pool_connections=max(10, jobs)))
+
+def synthesize_chunk(client, text, spool_dir, voice=VOICE_ID, cache=None):
+    """Streams one chunk's MP3 into a temporary file. Returns (path, cache hit, seconds taken)."""
+    started = time.monotonic()
+    with tempfile.NamedTemporaryFile(dir=spool_dir, suffix=".mp3", delete=False) as part:
+        pass
+    key = TtsCache.key("polly", text, voice, fmt="mp3")
+    if cache is not None and cache.get(key, part.name, len(text)):
+        return part.name, True, time.monotonic() - started
+
+    response = client.synthesize_speech(Text=text, OutputFormat='mp3', VoiceId=voice)
+    with open(part.name, 'wb') as out:
+        stream = response['AudioStream']
+        for block in iter(lambda: stream.read(STREAM_BLOCK), b""):
+            out.write(block)
+    if cache is not None:
+        cache.put(key, part.name, "polly", len(text))
+    return part.name, False, time.monotonic() - started
+
+def synthesize_text(text, output_file, client, jobs=DEFAULT_JOBS, voice=VOICE_ID, cache=None, ledger=None):
+    """Synthesizes any length of text to one MP3, `jobs` chunks at a time. Returns the characters billed.
+
+    Chunks found in `cache` are reused and not billed. Every chunk is recorded in `ledger`.
+
+    Each chunk is spooled to disk by its worker and appended to the output in order, so only the
+    in-flight audio streams are ever buffered. MP3 frames can be concatenated as they are.
+    """
+    chunks = split_text(text)
+    print(f"Synthesizing {len(chunks)} chunks with {jobs} concurrent requests.")
+    spool_dir = tempfile.mkdtemp(prefix=".polly_", dir=os.path.dirname(os.path.abspath(output_file)))
+    futures = []
+    recorded = 0  # futures[:recorded] are in the ledger
+    billed = 0
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(synthesize_chunk, client, chunk, spool_dir, voice, cache) for chunk in chunks]
+            try:
+                with open(output_file + ".tmp", 'wb') as out:
+                    for chunk, future in zip(chunks, futures):
+                        part_path, cached, latency = future.result()
+                        if not cached:
+                            billed += len(chunk)
+                        if ledger is not None:
+                            ledger.record(len(chunk), voice, cached, latency)
+                        recorded += 1
+                        with open(part_path, 'rb') as part:
+                            shutil.copyfileobj(part, out, STREAM_BLOCK)
+                        os.remove(part_path)
+            except BaseException:
+                # Don't start chunks whose audio will never be used
+                pool.shutdown(cancel_futures=True)
+                raise
+        os.replace(output_file + ".tmp", output_file)
+    finally:
+        # After a failure the requests already in flight still finish, and Polly bills them
+        if ledger is not None:
+            for chunk, future in zip(chunks[recorded:], futures[recorded:]):
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    _, cached, latency = future.result()
+                    ledger.record(len(chunk), voice, cached, latency)
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        if os.path.exists(output_file + ".tmp"):
+            os.remove(output_file + ".tmp")
+    return billed
 
 # Entry point
-def main():
-    if len(sys.argv) != 2:
-        print(f"Usage: python {os.path.basename(__file__)} input.txt")
-        sys.exit(1)
-
-    input_file = sys.argv[1]
+def main(argv=None, client=None):
+    parser = argparse.ArgumentParser(description="Convert a text file of any length to MP3 with Amazon Polly.")
+    parser.add_argument("input_file", help="Text file to read")
+    parser.add_argument("--output", help="MP3 to write (default: input name with .mp3)")
+    parser.add_argument("--voice", default=VOICE_ID, help=f"Polly voice (default {VOICE_ID})")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Concurrent synthesize_speech requests (default {DEFAULT_JOBS})")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help=f"Synthesized audio cache (default {CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Synthesize every chunk, even unchanged ones")
+    parser.add_argument("--ledger", default=LEDGER_FILE, help=f"Usage ledger database (default {LEDGER_FILE})")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    input_file = args.input_file
     base, _ = os.path.splitext(input_file)
-    output_file = f"{base}.mp3"
+    output_file = args.output or f"{base}.mp3"
 
     # Read input text
     try:
@@ -59,50 +156,39 @@ def main():
         print("Error: Input file is empty.")
         sys.exit(1)
 
-    char_count = len(text)
-    print(f"Input file contains {char_count} characters.")
+    print(f"Input file contains {len(text)} characters.")
 
-    if char_count > CHAR_LIMIT:
-        print(f"Error: Input text exceeds {CHAR_LIMIT} character limit.")
-        sys.exit(1)
-
-    # Create Polly client
-    try:
-        polly = boto3.client('polly')
-    except Exception as e:
-        print(f"Error initializing Polly client: {e}")
-        sys.exit(1)
+    # Create Polly client; callers (and tests) can pass their own, e.g. one wrapped in a botocore Stubber
+    if client is None:
+        try:
+            client = create_client(args.jobs)
+        except Exception as e:
+            print(f"Error initializing Polly client: {e}")
+            sys.exit(1)
 
     # Synthesize speech
+    cache = None if args.no_cache else TtsCache(args.cache_dir)
+    ledger = UsageLedger(args.ledger)
+    started = time.monotonic()
     try:
-        response = polly.synthesize_speech(
-            Text=text,
-            OutputFormat='mp3',
-            VoiceId=VOICE_ID
-        )
-    except Exception as e:
-        print(f"Error from Polly synthesize_speech: {e}")
+        char_count = synthesize_text(text, output_file, client, args.jobs, args.voice, cache, ledger)
+    except OSError as e:
+        print(f"Error saving audio to {output_file}: {e}")
         sys.exit(1)
-
-    # Save MP3
-    try:
-        with open(output_file, 'wb') as file:
-            file.write(response['AudioStream'].read())
     except Exception as e:
-        print(f"Error saving audio to {output_file}: {e}")
+        print(f"Error from Polly synthesize_speech: {e}")
         sys.exit(1)
+    finally:
+        if cache:
+            print(f"Cache: {cache.stats()}")
+            cache.close()
 
-    print(f"Audio saved to {output_file}")
-
-    # Update usage log
-    usage_log = load_usage_log()
-    usage_log = update_usage(usage_log, char_count)
-    save_usage_log(usage_log)
+    elapsed = time.monotonic() - started
+    print(f"Audio saved to {output_file} in {elapsed:.1f}s ({char_count:,} characters billed)")
 
-    # Report usage
-    now = datetime.datetime.utcnow()
-    key = f"{now.year}-{now.month:02}"
-    total_this_month = usage_log.get(key, 0)
+    # Report usage; cached chunks cost nothing and are not counted
+    total_this_month = ledger.month_total()
+    ledger.close()
     estimated_cost = estimate_cost(total_this_month)
 
     print(f"Characters used this month: {total_this_month:,}")
@@ -1,6 +1,11 @@
 import asyncio
-from edge_tts import Communicate
 import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from tts_cache import CACHE_DIR, TtsCache
 
 # FOR A LIST OF VOICES
 # edge-tts --list-voices | grep -E '"ShortName": "en-(US|GB)-'
@@ -23,23 +28,128 @@ edge-tts --text "Testing audio quality" \
          --write-media out.mp3
 '''
 
-parser = argparse.ArgumentParser()
-parser.add_argument("filename", help = "Text file needed")
-args = parser.parse_args()
-textfile = args.filename
+VOICE = "en-GB-RyanNeural"
+RATE = "-20%"       # slower speech
+PITCH = "+4Hz"      # slightly higher pitch
+OUTPUT_FORMAT = "audio-24khz-48kbitrate-mono-mp3"  # edge-tts default, part of the cache key
+OUTPUT_FILE = "output.mp3"
+DEFAULT_CONCURRENCY = 4  # edge-tts websockets open at once
+
+def read_paragraphs(path):
+  """Yields the paragraphs of a text file one at a time, so long books are never held whole."""
+  lines = []
+  with open(path, "r", encoding="utf-8") as f:
+    for line in f:
+      if line.strip():
+        lines.append(line)
+      elif lines:
+        yield " ".join("".join(lines).split())
+        lines = []
+  if lines:
+    yield " ".join("".join(lines).split())
+
+async def synthesize_paragraph(text, part_path, voice=VOICE, rate=RATE, pitch=PITCH, cache=None):
+    """Writes one paragraph's audio to part_path, from the cache when it was synthesized before.
 
-with open(textfile, "r", encoding="utf-8") as f:
-  file_text = f.read()
+    Returns True on a cache hit.
+    """
+    key = TtsCache.key("edge", text, voice, rate, pitch, OUTPUT_FORMAT)
+    if cache is not None and cache.get(key, part_path, len(text)):
+        return True
+    from edge_tts import Communicate  # only needed on a cache miss
 
-async def tts():
     communicate = Communicate(
-        text=file_text,
-        voice="en-GB-RyanNeural",
-        rate="-20%",       # slower speech
-        pitch="+4Hz",      # slightly higher pitch
+        text=text,
+        voice=voice,
+        rate=rate,
+        pitch=pitch,
         # volume: str = "0dB",
         # output_format: str = "audio-24khz-48kbitrate-mono-mp3"
     )
-    await communicate.save("output.mp3")
+    await communicate.save(part_path)
+    if cache is not None:
+        cache.put(key, part_path, "edge", len(text))
+    return False
+
+async def tts(paragraph_iter, output_file=OUTPUT_FILE, voice=VOICE, rate=RATE, pitch=PITCH, cache=None,
+              concurrency=DEFAULT_CONCURRENCY):
+    """Synthesizes paragraphs concurrently and streams their audio into output_file in order.
+
+    Up to `concurrency` paragraphs are synthesized at once, each into its own spool file; the
+    writer appends them in document order as soon as the next one is ready, and only a bounded
+    window of paragraphs is read ahead of it. Returns (paragraphs, characters, cache hits).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    spool_dir = tempfile.mkdtemp(prefix=".tts_", dir=os.path.dirname(os.path.abspath(output_file)))
+    tasks = []
+    totals = {"paragraphs": 0, "chars": 0, "cached": 0}
+
+    async def synthesize(i, text):
+        part_path = os.path.join(spool_dir, f"{i:06d}.mp3")
+        async with semaphore:
+            cached = await synthesize_paragraph(text, part_path, voice, rate, pitch, cache)
+        return part_path, cached
+
+    async def produce():
+        for i, text in enumerate(paragraph_iter):
+            task = asyncio.create_task(synthesize(i, text))
+            tasks.append(task)
+            await queue.put((text, task))
+        await queue.put(None)
+
+    async def write(out):
+        while (item := await queue.get()) is not None:
+            text, task = item
+            part_path, cached = await task
+            with open(part_path, "rb") as part:
+                shutil.copyfileobj(part, out)
+            os.remove(part_path)
+            totals["paragraphs"] += 1
+            totals["chars"] += len(text)
+            totals["cached"] += cached
+
+    try:
+        with open(output_file + ".tmp", "wb") as out:
+            await asyncio.gather(produce(), write(out))
+        os.replace(output_file + ".tmp", output_file)
+    finally:
+        for task in tasks:
+            task.cancel()
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        if os.path.exists(output_file + ".tmp"):
+            os.remove(output_file + ".tmp")
+    return totals["paragraphs"], totals["chars"], totals["cached"]
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="Read a text file aloud with edge-tts.")
+  parser.add_argument("filename", help = "Text file needed")
+  parser.add_argument("--output", default=OUTPUT_FILE, help=f"MP3 to write (default {OUTPUT_FILE})")
+  parser.add_argument("--voice", default=VOICE, help=f"edge-tts voice (default {VOICE})")
+  parser.add_argument("--rate", default=RATE, help=f"Speaking rate, e.g. -20%% or +10%% (default {RATE.replace('%', '%%')})")
+  parser.add_argument("--pitch", default=PITCH, help=f"Pitch shift, e.g. +4Hz (default {PITCH})")
+  parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                      help=f"Paragraphs synthesized at once (default {DEFAULT_CONCURRENCY})")
+  parser.add_argument("--cache-dir", default=CACHE_DIR, help=f"Synthesized audio cache (default {CACHE_DIR})")
+  parser.add_argument("--no-cache", action="store_true", help="Synthesize every paragraph, even unchanged ones")
+  args = parser.parse_args(argv)
+  if args.concurrency < 1:
+    parser.error("--concurrency must be at least 1")
+  textfile = args.filename
+
+  cache = None if args.no_cache else TtsCache(args.cache_dir)
+  started = time.monotonic()
+  try:
+    count, chars, cached = asyncio.run(tts(read_paragraphs(textfile), args.output, args.voice, args.rate,
+                                           args.pitch, cache, args.concurrency))
+  finally:
+    if cache:
+      print(f"Cache: {cache.stats()}")
+      cache.close()
+
+  elapsed = time.monotonic() - started
+  print(f"Wrote {args.output}: {count} paragraphs ({cached} from cache), {chars:,} characters "
+        f"in {elapsed:.1f}s, {chars / elapsed:.0f} chars/s.")
 
-asyncio.run(tts())
+if __name__ == "__main__":
+  main()
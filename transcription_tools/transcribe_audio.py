@@ -1,6 +1,15 @@
-import whisper # pip install openai-whisper
 import argparse
+import glob
+import json
+import multiprocessing
 import os
+import subprocess
+import time
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 '''
 Keep expectations realistic
@@ -14,6 +23,8 @@ medium	1.5–3 hours
 large	Don’t even try
 
 TO NORMALIZE: ffmpeg -i /mnt/h/TECH/INTERVIEWS/Audio_07_31_2025_09_53_39.mp3  -ac 1 -ar 16000 -c:a pcm_s16le Audio_07_31_2025_09_53_39.wav 
+The script now does this itself: it decodes with loudnorm straight to 16 kHz mono and drops
+silent stretches before Whisper sees them (--no-normalize, --no-vad, --silence-db to tune).
 
 1. Audio Input Issues
 Whisper is extremely sensitive to the audio it receives.
@@ -99,45 +110,459 @@ Or add to transcribe_args in the dictionary like:
 transcribe_args["no_speech_threshold"] = 0.6
 '''
 
-parser = argparse.ArgumentParser()
-parser.add_argument("filename", help="this needs an mp3 filename")
-parser.add_argument("--file_dir", default="/mnt/h/TECH/INTERVIEWS/", help="Directory for the input .mp3 file")
-parser.add_argument("--output_dir", default="/mnt/h/TECH/INTERVIEWS/", help="Directory for the output .txt file")
-parser.add_argument("--model", default="base", help="Whisper model size (e.g. base, medium, large)")
-parser.add_argument("--language", help="Force language (e.g., 'en')")
-parser.add_argument("--verbose", action="store_true", help="Enable debug messages")
-
-args = parser.parse_args()
-input_file = args.filename
-input_dir = args.file_dir
-output_dir = args.output_dir
-
-# Convert input .mp3 filename to output.txt
-base_name = os.path.splitext(os.path.basename(input_file))[0]
-
-# Input full path
-input_file_fullpath = output_dir + input_file
-
-# Output file and directory
-output_file = base_name + ".txt"
-output_file_fullpath = output_dir + output_file
-
 # Whisper docs
 # https://github.com/openai/whisper
+# https://github.com/SYSTRAN/faster-whisper (CTranslate2 port, several times faster on CPU with int8)
+
+MODEL_NAME = "small.en"  # there is small, medium
+DEFAULT_BACKEND = "whisper"
+DEFAULT_COMPUTE_TYPE = "int8"  # faster-whisper only; float32 to match the PyTorch model exactly
+SAMPLE_RATE = 16000  # 16 kHz mono float32, what both backends consume
+AUDIO_PATTERN = "*.mp3"
+POLL_SECONDS = 10
+DEFAULT_CHUNK_SECONDS = 300
+SILENCE_SEARCH_SECONDS = 20  # how far around each chunk boundary to look for a quiet spot
+FRAME_SECONDS = 0.03  # energy is measured over 30 ms frames
+
+# Energy gate, applied after loudnorm has brought speech to roughly -24 dBFS
+DEFAULT_SILENCE_DB = -45
+MIN_SILENCE_SECONDS = 1.0  # shorter pauses stay inside a speech span
+SPEECH_PAD_SECONDS = 0.25  # kept either side of each span so word edges survive
+MIN_SPEECH_SECONDS = 0.3  # shorter blips (clicks, coughs) are dropped
+JOIN_GAP_SECONDS = 0.3  # silence put between spans packed into one chunk
+
+# What each line of the <name>.jsonl segment journal holds
+SEGMENT_FIELDS = ("start", "end", "text", "avg_logprob", "no_speech_prob")
 
-model = whisper.load_model("small.en")  # there is small, medium
 # temperature controls randomness of transcription
 # 1.0 is more random
 # 0.0 is most deterministic.  more confident
 # use when hallucinating
-result = model.transcribe(
-  input_file_fullpath, 
-  temperature=0, 
-  verbose=True, 
+TRANSCRIBE_ARGS = dict(
+  temperature=0,
   fp16=False,
   no_speech_threshold=0.6
-  ) 
-
-# Write transcribed text to output file
-with open(output_file_fullpath, 'w', encoding="utf-8") as file:
-  file.write(result['text']) 
+  )
+
+class WhisperBackend:
+  """The reference openai-whisper PyTorch model."""
+
+  def __init__(self, model_name, threads=None, compute_type=None):
+    import whisper # pip install openai-whisper
+    if threads:
+      import torch
+      torch.set_num_threads(threads)  # Keep workers from fighting over the same cores
+    self.model = whisper.load_model(model_name, device="cpu" if threads else None)
+
+  def transcribe(self, samples, language=None, verbose=None):
+    # openai-whisper only hands segments back once the whole chunk is decoded
+    result = self.model.transcribe(samples, language=language, verbose=verbose, **TRANSCRIBE_ARGS)
+    for segment in result["segments"]:
+      yield {k: v for k, v in segment.items() if k != "tokens"}
+
+class FasterWhisperBackend:
+  """faster-whisper on CTranslate2. fp16 from TRANSCRIBE_ARGS becomes the compute type instead."""
+
+  def __init__(self, model_name, threads=None, compute_type=DEFAULT_COMPUTE_TYPE):
+    from faster_whisper import WhisperModel # pip install faster-whisper
+    if TRANSCRIBE_ARGS["fp16"]:
+      compute_type = "float16"
+    self.model = WhisperModel(model_name, device="cpu", compute_type=compute_type,
+                              cpu_threads=threads or os.cpu_count() or 0)
+    self.args = {k: v for k, v in TRANSCRIBE_ARGS.items() if k != "fp16"}
+
+  def transcribe(self, samples, language=None, verbose=None):
+    # Segments are generated lazily; decoding happens while iterating
+    generated, _ = self.model.transcribe(samples, language=language, **self.args)
+    for segment in generated:
+      if verbose:
+        print(f"[{segment.start:.3f} --> {segment.end:.3f}] {segment.text}")
+      yield {"id": segment.id, "seek": segment.seek, "start": segment.start, "end": segment.end,
+             "text": segment.text, "temperature": segment.temperature,
+             "avg_logprob": segment.avg_logprob, "compression_ratio": segment.compression_ratio,
+             "no_speech_prob": segment.no_speech_prob}
+
+BACKENDS = {
+  "whisper": WhisperBackend,
+  "faster-whisper": FasterWhisperBackend,
+}
+
+def load_backend(name, model_name, threads=None, compute_type=DEFAULT_COMPUTE_TYPE):
+  return BACKENDS[name](model_name, threads, compute_type)
+
+def load_audio(path, normalize=True):
+  """Decodes any ffmpeg-readable file straight to 16 kHz mono float32, optionally loudness-normalised.
+
+  Same as `ffmpeg -i in.mp3 -af loudnorm -ac 1 -ar 16000 -c:a pcm_s16le out.wav`,
+  but piped into memory instead of written to an intermediate WAV.
+  """
+  cmd = ["ffmpeg", "-nostdin", "-threads", "0", "-i", path]
+  if normalize:
+    cmd += ["-af", "loudnorm"]
+  cmd += ["-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-"]
+  try:
+    out = subprocess.run(cmd, capture_output=True, check=True).stdout
+  except subprocess.CalledProcessError as e:
+    raise RuntimeError(f"Failed to load audio: {e.stderr.decode(errors='replace')}") from e
+  return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+def frame_energy(audio, frame):
+  n_frames = len(audio) // frame
+  return np.square(audio[:n_frames * frame].reshape(n_frames, frame)).mean(axis=1)
+
+def speech_spans(audio, silence_db=DEFAULT_SILENCE_DB):
+  """Returns (start, end) sample spans that contain speech according to a frame energy gate."""
+  frame = int(FRAME_SECONDS * SAMPLE_RATE)
+  energy_db = 10 * np.log10(frame_energy(audio, frame) + 1e-10)
+  voiced = np.flatnonzero(energy_db > silence_db)
+  if len(voiced) == 0:
+    return []
+
+  # Runs of voiced frames separated by less than MIN_SILENCE_SECONDS belong together
+  breaks = np.flatnonzero(np.diff(voiced) > MIN_SILENCE_SECONDS / FRAME_SECONDS)
+  starts = np.concatenate(([voiced[0]], voiced[breaks + 1]))
+  ends = np.concatenate((voiced[breaks], [voiced[-1]])) + 1
+
+  pad = int(SPEECH_PAD_SECONDS * SAMPLE_RATE)
+  spans = []
+  for start, end in zip(starts * frame, ends * frame):
+    if end - start < MIN_SPEECH_SECONDS * SAMPLE_RATE:
+      continue
+    start, end = max(0, start - pad), min(len(audio), end + pad)
+    if spans and start <= spans[-1][1]:
+      spans[-1] = (spans[-1][0], end)
+    else:
+      spans.append((int(start), int(end)))
+  return spans
+
+def split_on_silence(audio, chunk_seconds):
+  """Splits the audio into (start, end) sample spans of roughly `chunk_seconds`.
+
+  Each cut is moved to the quietest 30 ms frame within SILENCE_SEARCH_SECONDS of the
+  nominal boundary, so words are not chopped in half between workers.
+  """
+  chunk = int(chunk_seconds * SAMPLE_RATE)
+  frame = int(FRAME_SECONDS * SAMPLE_RATE)
+  search = int(SILENCE_SEARCH_SECONDS * SAMPLE_RATE) // frame
+  energy = frame_energy(audio, frame)
+
+  cuts = [0]
+  # Don't leave a tiny tail chunk; let the last one run up to 1.5x long
+  while len(audio) - cuts[-1] > chunk * 1.5:
+    target = (cuts[-1] + chunk) // frame
+    lo, hi = max(cuts[-1] // frame + 1, target - search), min(len(energy), target + search)
+    quietest = lo + int(np.argmin(energy[lo:hi]))
+    cuts.append(quietest * frame + frame // 2)
+  cuts.append(len(audio))
+  return list(zip(cuts[:-1], cuts[1:]))
+
+def build_chunks(audio, spans, chunk_seconds=None):
+  """Packs speech spans into chunks of about `chunk_seconds` (one chunk if None).
+
+  Spans longer than a chunk are first cut at quiet points. Returns a list of chunks,
+  each a list of (start, end) sample spans of the original recording.
+  """
+  if chunk_seconds is None:
+    return [spans] if spans else []
+  limit = int(chunk_seconds * SAMPLE_RATE)
+
+  pieces = []
+  for start, end in spans:
+    if end - start > limit * 1.5:
+      pieces.extend((start + s, start + e) for s, e in split_on_silence(audio[start:end], chunk_seconds))
+    else:
+      pieces.append((start, end))
+
+  chunks, current, length = [], [], 0
+  for start, end in pieces:
+    if current and length + (end - start) > limit:
+      chunks.append(current)
+      current, length = [], 0
+    current.append((start, end))
+    length += end - start
+  if current:
+    chunks.append(current)
+  return chunks
+
+def assemble_chunk(audio, spans):
+  """Concatenates spans with a short pause between them.
+
+  Returns (samples, time map) where the time map lists (chunk offset, original offset)
+  pairs in seconds for translating timestamps back to the recording.
+  """
+  gap = np.zeros(int(JOIN_GAP_SECONDS * SAMPLE_RATE), dtype=np.float32)
+  parts, time_map, position = [], [], 0
+  for start, end in spans:
+    if parts:
+      parts.append(gap)
+      position += len(gap)
+    parts.append(audio[start:end])
+    time_map.append((position / SAMPLE_RATE, start / SAMPLE_RATE))
+    position += end - start
+  return np.concatenate(parts), time_map
+
+def to_original_time(t, time_map):
+  i = max(0, bisect_right([chunk_offset for chunk_offset, _ in time_map], t) - 1)
+  chunk_offset, original_offset = time_map[i]
+  return original_offset + max(0.0, t - chunk_offset)
+
+def transcribe_samples(model, samples, time_map, language=None, verbose=None):
+  """Yields the segments of one assembled chunk with times mapped back to the full recording."""
+  for segment in model.transcribe(samples, language, verbose):
+    segment["start"] = to_original_time(segment["start"], time_map)
+    segment["end"] = to_original_time(segment["end"], time_map)
+    yield segment
+
+# One model per worker process, loaded once by the pool initializer
+worker_model = None
+
+def init_worker(backend, model_name, threads, compute_type):
+  global worker_model
+  worker_model = load_backend(backend, model_name, threads, compute_type)
+
+def transcribe_chunk(samples, time_map, language=None):
+  return list(transcribe_samples(worker_model, samples, time_map, language))
+
+def prepare_audio(input_path, normalize=True, vad=True, silence_db=DEFAULT_SILENCE_DB, resume_from=0.0):
+  """Loads the recording and finds its speech spans after `resume_from` seconds. Reports how much silence was dropped."""
+  audio = load_audio(input_path, normalize)
+  total = len(audio) / SAMPLE_RATE
+  spans = speech_spans(audio, silence_db) if vad else [(0, len(audio))]
+  if resume_from:
+    offset = int(resume_from * SAMPLE_RATE)
+    spans = [(max(start, offset), end) for start, end in spans if end > offset]
+    print(f"Resuming at {resume_from:.1f}s.")
+  kept = sum(end - start for start, end in spans) / SAMPLE_RATE
+  print(f"{total:.0f}s of audio, {kept:.0f}s of speech; skipped {total - kept:.0f}s of silence "
+        f"({(total - kept) / total:.0%})." if total else "Audio is empty.")
+  return audio, spans
+
+class Transcriber:
+  """Keeps the model warm across files: loaded once here, or once per worker process when workers > 1."""
+
+  def __init__(self, model_name=MODEL_NAME, language=None, workers=1, chunk_seconds=DEFAULT_CHUNK_SECONDS,
+               normalize=True, vad=True, silence_db=DEFAULT_SILENCE_DB, verbose=True,
+               backend=DEFAULT_BACKEND, compute_type=DEFAULT_COMPUTE_TYPE):
+    self.language = language
+    self.workers = workers
+    self.chunk_seconds = chunk_seconds
+    self.normalize = normalize
+    self.vad = vad
+    self.silence_db = silence_db
+    self.verbose = verbose
+    self.model = None
+    self.pool = None
+
+    started = time.monotonic()
+    if workers > 1:
+      threads = max(1, (os.cpu_count() or 1) // workers)
+      # spawn, not fork: torch does not survive being forked after it has started threads
+      context = multiprocessing.get_context("spawn")
+      self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker,
+                                      initargs=(backend, model_name, threads, compute_type))
+      print(f"Started {workers} {backend} workers for {model_name}.")
+    else:
+      self.model = load_backend(backend, model_name, compute_type=compute_type)
+      print(f"Loaded {model_name} ({backend}) in {time.monotonic() - started:.1f}s.")
+
+  def transcribe(self, input_path, resume_from=0.0):
+    """Yields segments in order as they are decoded, starting `resume_from` seconds into the recording."""
+    audio, spans = prepare_audio(input_path, self.normalize, self.vad, self.silence_db, resume_from)
+    # Chunked in single-process mode too, so openai-whisper hands back segments every chunk, not once at the end
+    chunks = build_chunks(audio, spans, self.chunk_seconds)
+    if self.pool:
+      print(f"Transcribing {len(chunks)} chunks across {self.workers} workers.")
+      started = time.monotonic()
+      futures = [self.pool.submit(transcribe_chunk, *assemble_chunk(audio, chunk), self.language)
+                 for chunk in chunks]
+      for i, future in enumerate(futures, 1):
+        yield from future.result()
+        print(f"Chunk {i}/{len(chunks)} done after {time.monotonic() - started:.0f}s")
+    else:
+      for chunk in chunks:
+        yield from transcribe_samples(self.model, *assemble_chunk(audio, chunk), self.language, self.verbose)
+
+  def close(self):
+    if self.pool:
+      self.pool.shutdown()
+
+def transcript_path(input_path, output_dir, extension=".txt"):
+  # Convert input .mp3 filename to output.txt
+  base_name = os.path.splitext(os.path.basename(input_path))[0]
+  return os.path.join(output_dir, base_name + extension)
+
+def is_up_to_date(input_path, output_path):
+  return os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(input_path)
+
+def find_inputs(input_dir, names, pattern=AUDIO_PATTERN):
+  """Input files named on the command line (globs allowed), or everything matching `pattern` in input_dir."""
+  patterns = [os.path.join(input_dir, name) for name in names] if names else [os.path.join(input_dir, pattern)]
+  found = []
+  for p in patterns:
+    found.extend(sorted(glob.glob(p)) if glob.has_magic(p) else [p])
+  return found
+
+def read_segments(path):
+  """Segments already in a JSONL journal. A line cut short by a crash, and anything after it, is ignored."""
+  segments = []
+  if not os.path.exists(path):
+    return segments
+  with open(path, "r", encoding="utf-8") as f:
+    for line in f:
+      try:
+        segments.append(json.loads(line))
+      except json.JSONDecodeError:
+        break
+  return segments
+
+def write_atomic(path, text):
+  # A half-written transcript must never look up to date
+  with open(path + ".tmp", 'w', encoding="utf-8") as file:
+    file.write(text)
+  os.replace(path + ".tmp", path)
+
+def timestamp(seconds, separator):
+  millis = round(seconds * 1000)
+  hours, millis = divmod(millis, 3_600_000)
+  minutes, millis = divmod(millis, 60_000)
+  secs, millis = divmod(millis, 1000)
+  return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+def write_srt(segments, path):
+  cues = [f"{i}\n{timestamp(s['start'], ',')} --> {timestamp(s['end'], ',')}\n{s['text'].strip()}\n"
+          for i, s in enumerate(segments, 1)]
+  write_atomic(path, "\n".join(cues))
+
+def write_vtt(segments, path):
+  cues = [f"{timestamp(s['start'], '.')} --> {timestamp(s['end'], '.')}\n{s['text'].strip()}\n" for s in segments]
+  write_atomic(path, "\n".join(["WEBVTT\n", *cues]))
+
+def write_txt(segments, path):
+  write_atomic(path, "".join(s["text"] for s in segments))
+
+WRITERS = {
+  "srt": write_srt,
+  "vtt": write_vtt,
+}
+
+def transcribe_file(transcriber, input_path, output_dir, formats=(), resume=False):
+  """Journals segments to <name>.jsonl as they are decoded, then writes the .txt and any subtitle formats.
+
+  With `resume`, segments already in the journal are kept and decoding restarts where the last one ended.
+  """
+  started = time.monotonic()
+  journal_path = transcript_path(input_path, output_dir, ".jsonl")
+  # A journal older than the audio belongs to a previous recording
+  segments = read_segments(journal_path) if resume and is_up_to_date(input_path, journal_path) else []
+  resume_from = segments[-1]["end"] if segments else 0.0
+
+  # Rewrite what survived, dropping any torn last line, then append new segments as they arrive
+  with open(journal_path, "w", encoding="utf-8") as journal:
+    for segment in segments:
+      journal.write(json.dumps(segment, ensure_ascii=False) + "\n")
+    for segment in transcriber.transcribe(input_path, resume_from):
+      record = {key: segment.get(key) for key in SEGMENT_FIELDS}
+      record["start"], record["end"] = round(record["start"], 3), round(record["end"], 3)
+      journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+      journal.flush()
+      segments.append(record)
+
+  for extension in formats:
+    WRITERS[extension](segments, transcript_path(input_path, output_dir, "." + extension))
+  # The .txt goes last: it is what marks the recording as done
+  output_path = transcript_path(input_path, output_dir)
+  write_txt(segments, output_path)
+  print(f"Wrote {output_path} ({len(segments)} segments) in {time.monotonic() - started:.0f}s.")
+
+def run_queue(transcriber, input_dir, names, output_dir, pattern=AUDIO_PATTERN, force=False,
+              watch=False, poll=POLL_SECONDS, formats=(), resume=False):
+  """Transcribes every input without an up-to-date transcript; with `watch`, keeps polling for new ones."""
+  queue = deque()
+  seen = {}  # path -> mtime when it was queued or skipped
+  sizes = {}  # path -> size on the previous poll, to tell when a new file has finished copying
+  counts = {"transcribed": 0, "up to date": 0, "failed": 0}
+  while True:
+    for path in find_inputs(input_dir, names, pattern):
+      if not os.path.isfile(path):
+        if not watch:
+          print(f"No such file: {path}")
+          counts["failed"] += 1
+        continue
+      mtime = os.path.getmtime(path)
+      if seen.get(path) == mtime:
+        continue
+      if watch:
+        size = os.path.getsize(path)
+        if sizes.get(path) != size:
+          sizes[path] = size
+          continue
+      seen[path] = mtime
+      if not force and is_up_to_date(path, transcript_path(path, output_dir)):
+        counts["up to date"] += 1
+        continue
+      queue.append(path)
+
+    while queue:
+      path = queue.popleft()
+      print(f"Transcribing {path} ({len(queue)} more queued)")
+      try:
+        transcribe_file(transcriber, path, output_dir, formats, resume)
+        counts["transcribed"] += 1
+      except RuntimeError as e:
+        print(f"Error transcribing {path}: {e}")
+        counts["failed"] += 1
+
+    if not watch:
+      break
+    time.sleep(poll)
+
+  print(", ".join(f"{count} {outcome}" for outcome, count in counts.items()) + ".")
+
+def main(argv=None):
+  parser = argparse.ArgumentParser()
+  parser.add_argument("filenames", nargs="*",
+                      help=f"Audio files or globs under --file_dir (default: every {AUDIO_PATTERN} there)")
+  parser.add_argument("--file_dir", default="/mnt/h/TECH/INTERVIEWS/", help="Directory for the input .mp3 file")
+  parser.add_argument("--output_dir", default="/mnt/h/TECH/INTERVIEWS/", help="Directory for the output .txt file")
+  parser.add_argument("--model", default=MODEL_NAME, help=f"Whisper model size (e.g. base, medium, large; default {MODEL_NAME})")
+  parser.add_argument("--language", help="Force language (e.g., 'en')")
+  parser.add_argument("--backend", choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                      help=f"Inference implementation (default {DEFAULT_BACKEND})")
+  parser.add_argument("--compute-type", default=DEFAULT_COMPUTE_TYPE,
+                      help=f"faster-whisper quantisation, e.g. int8, int8_float32, float32 (default {DEFAULT_COMPUTE_TYPE})")
+  parser.add_argument("--verbose", action="store_true", help="Enable debug messages")
+  parser.add_argument("--workers", type=int, default=1,
+                      help="Transcribe chunks in this many processes, one model each (default 1)")
+  parser.add_argument("--chunk-seconds", type=float, default=DEFAULT_CHUNK_SECONDS,
+                      help=f"Target chunk length; segments are journaled at least this often (default {DEFAULT_CHUNK_SECONDS})")
+  parser.add_argument("--no-normalize", action="store_true", help="Skip ffmpeg loudnorm when decoding")
+  parser.add_argument("--no-vad", action="store_true", help="Transcribe silent stretches too")
+  parser.add_argument("--silence-db", type=float, default=DEFAULT_SILENCE_DB,
+                      help=f"Frames quieter than this (dBFS) count as silence (default {DEFAULT_SILENCE_DB})")
+  parser.add_argument("--pattern", default=AUDIO_PATTERN,
+                      help=f"Files to pick up when no filenames are given (default {AUDIO_PATTERN})")
+  parser.add_argument("--force", action="store_true", help="Transcribe even if the transcript is newer than the audio")
+  parser.add_argument("--formats", nargs="+", choices=sorted(WRITERS), default=[],
+                      help="Subtitle files to write next to the .txt and .jsonl")
+  parser.add_argument("--resume", action="store_true",
+                      help="Continue unfinished transcripts after the last segment in their .jsonl journal")
+  parser.add_argument("--watch", action="store_true", help="Keep running and transcribe new files as they appear")
+  parser.add_argument("--poll", type=float, default=POLL_SECONDS,
+                      help=f"Seconds between directory scans with --watch (default {POLL_SECONDS})")
+
+  args = parser.parse_args(argv)
+  os.makedirs(args.output_dir, exist_ok=True)
+
+  transcriber = Transcriber(args.model, args.language, args.workers, args.chunk_seconds,
+                            not args.no_normalize, not args.no_vad, args.silence_db, args.verbose,
+                            args.backend, args.compute_type)
+  try:
+    run_queue(transcriber, args.file_dir, args.filenames, args.output_dir, args.pattern,
+              args.force, args.watch, args.poll, args.formats, args.resume)
+  except KeyboardInterrupt:
+    print("Stopped.")
+  finally:
+    transcriber.close()
+
+if __name__ == "__main__":
+  main()
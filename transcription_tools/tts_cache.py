@@ -0,0 +1,124 @@
+"""Content-addressed on-disk cache for synthesized speech, shared by the TTS tools.
+
+    from tts_cache import TtsCache
+
+    cache = TtsCache()
+    key = cache.key("polly", chunk, voice="Joanna", fmt="mp3")
+    if not cache.get(key, part_path):    # copies the stored audio to part_path on a hit
+        ...synthesize to part_path...
+        cache.put(key, part_path)
+
+Audio is stored one file per chunk under a hash of everything that affects the
+output (service, text, voice, rate, pitch, format), so an unchanged paragraph is
+never synthesized or billed twice, whichever document it appears in. A small
+SQLite index tracks sizes and access times for least-recently-used eviction.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+CACHE_DIR = os.environ.get("TTS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "tts_cache"))
+INDEX_FILE = "index.sqlite"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audio (
+    key TEXT PRIMARY KEY,
+    service TEXT NOT NULL,
+    chars INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS audio_last_access ON audio (last_access);
+"""
+
+
+class TtsCache:
+    """Audio files keyed by content hash, with an LRU size budget. Safe to share between threads."""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(directory, INDEX_FILE), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM audio").fetchone()[0]
+        self.hits = self.misses = 0
+        self.hit_chars = self.miss_chars = 0
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def key(service, text, voice, rate=None, pitch=None, fmt="mp3"):
+        params = json.dumps([service, text, voice, rate, pitch, fmt], ensure_ascii=False)
+        return hashlib.sha256(params.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key, dest_path, chars=0):
+        """Copies the stored audio for `key` to `dest_path`. Returns False on a miss.
+
+        The copy happens under the lock so a concurrent put() cannot evict the file halfway.
+        `chars` only feeds the statistics.
+        """
+        path = self.path(key)
+        with self._lock:
+            row = self.conn.execute("SELECT size FROM audio WHERE key = ?", (key,)).fetchone()
+            if row is None or not os.path.exists(path):
+                self.misses += 1
+                self.miss_chars += chars
+                return False
+            shutil.copyfile(path, dest_path)
+            with self.conn:
+                self.conn.execute("UPDATE audio SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            self.hit_chars += chars
+        return True
+
+    def put(self, key, source_path, service="", chars=0):
+        """Copies a freshly synthesized file into the cache. The caller keeps `source_path`."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"  # two threads may store the same chunk at once
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+
+        now = time.time()
+        with self._lock, self.conn:
+            old = self.conn.execute("SELECT size FROM audio WHERE key = ?", (key,)).fetchone()
+            self.conn.execute("INSERT OR REPLACE INTO audio VALUES (?, ?, ?, ?, ?, ?)",
+                              (key, service, chars, size, now, now))
+            self._size += size - (old[0] if old else 0)
+            self._evict(keep=key)
+
+    def _evict(self, keep):
+        # Caller holds the lock; drop least recently used entries until back under budget
+        while self._size > self.max_bytes:
+            rows = self.conn.execute("SELECT key, size FROM audio WHERE key != ? ORDER BY last_access LIMIT 100",
+                                     (keep,)).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self.conn.execute("DELETE FROM audio WHERE key = ?", (key,))
+                try:
+                    os.remove(self.path(key))
+                except FileNotFoundError:
+                    pass
+                self._size -= size
+                if self._size <= self.max_bytes:
+                    break
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "chars_saved": self.hit_chars,
+                "size_mb": round(self._size / 1024 / 1024, 1)}
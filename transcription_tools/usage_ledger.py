@@ -0,0 +1,145 @@
+"""Append-only ledger of text-to-speech requests, safe to share between concurrent runs.
+
+    python usage_ledger.py report              # per-month requests, throughput and cost
+    python usage_ledger.py report --months 3
+
+Every synthesis request (or cache hit) is one row in SQLite, written in WAL mode, so
+parallel runs append without losing each other's updates. Monthly totals come from
+an index on (month, cached, chars) instead of rescanning the whole history. The old
+polly_usage_log.json month totals are imported once, the first time the ledger opens.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sqlite3
+import time
+
+LEDGER_FILE = "polly_usage.sqlite"
+USAGE_LOG_FILE = "polly_usage_log.json"  # the JSON month totals used before the ledger
+STANDARD_FREE_TIER_LIMIT = 5_000_000  # characters
+STANDARD_COST_PER_MILLION = 4.00  # USD
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    month TEXT NOT NULL,
+    service TEXT NOT NULL,
+    voice TEXT,
+    chars INTEGER NOT NULL,
+    cached INTEGER NOT NULL,
+    latency REAL
+);
+CREATE INDEX IF NOT EXISTS requests_month ON requests (month, cached, chars);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+MONTHLY_QUERY = """
+SELECT month,
+       COUNT(*),
+       COALESCE(SUM(CASE WHEN cached THEN 0 ELSE chars END), 0),
+       COALESCE(SUM(CASE WHEN cached THEN chars ELSE 0 END), 0),
+       SUM(CASE WHEN cached OR latency IS NULL THEN 0 ELSE chars END),
+       SUM(CASE WHEN cached THEN 0 ELSE latency END)
+FROM requests
+GROUP BY month
+ORDER BY month DESC
+LIMIT ?
+"""
+
+
+def month_key(ts=None):
+    now = datetime.datetime.fromtimestamp(ts or time.time(), datetime.timezone.utc)
+    return f"{now.year}-{now.month:02}"
+
+
+def estimate_cost(total_chars):
+    if total_chars <= STANDARD_FREE_TIER_LIMIT:
+        return 0.0
+    overage = total_chars - STANDARD_FREE_TIER_LIMIT
+    return (overage / 1_000_000) * STANDARD_COST_PER_MILLION
+
+
+class UsageLedger:
+    def __init__(self, path=LEDGER_FILE, legacy_log=USAGE_LOG_FILE):
+        # A generous busy timeout lets concurrent runs queue for the write lock instead of failing
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        if legacy_log:
+            self._import_legacy(legacy_log)
+
+    def close(self):
+        self.conn.close()
+
+    def _import_legacy(self, legacy_log):
+        if not os.path.exists(legacy_log):
+            return
+        with self.conn:
+            # BEGIN IMMEDIATE takes the write lock first, so two runs can't both import the file
+            self.conn.execute("BEGIN IMMEDIATE")
+            if self.conn.execute("SELECT 1 FROM meta WHERE name = 'legacy_imported'").fetchone():
+                return
+            with open(legacy_log, "r") as f:
+                totals = json.load(f)
+            for month, chars in sorted(totals.items()):
+                # Month totals only: no voice or latency, timestamped at the start of that month
+                ts = datetime.datetime.strptime(month, "%Y-%m").replace(tzinfo=datetime.timezone.utc).timestamp()
+                self.conn.execute(
+                    "INSERT INTO requests (ts, month, service, voice, chars, cached, latency) VALUES (?, ?, ?, ?, ?, 0, NULL)",
+                    (ts, month, "polly", None, chars),
+                )
+            self.conn.execute("INSERT INTO meta VALUES ('legacy_imported', ?)", (legacy_log,))
+        print(f"Imported {len(totals)} months from {legacy_log} into the usage ledger.")
+
+    def record(self, chars, voice=None, cached=False, latency=None, service="polly"):
+        """Appends one request. Cache hits are recorded for the statistics but never billed."""
+        ts = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO requests (ts, month, service, voice, chars, cached, latency) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (ts, month_key(ts), service, voice, chars, int(cached), latency),
+            )
+
+    def month_total(self, month=None):
+        """Billed characters in `month` (default: this month)."""
+        row = self.conn.execute("SELECT COALESCE(SUM(chars), 0) FROM requests WHERE month = ? AND cached = 0",
+                                (month or month_key(),)).fetchone()
+        return row[0]
+
+    def monthly(self, months=12):
+        """Rows of (month, requests, billed chars, cached chars, timed chars, synthesis seconds), newest first."""
+        return self.conn.execute(MONTHLY_QUERY, (months,)).fetchall()
+
+
+def report(ledger, months=12):
+    print(f"{'month':<8} {'requests':>9} {'billed':>12} {'cached':>12} {'chars/s':>9} {'cost':>9}")
+    for month, requests, billed, cached, timed_chars, seconds in ledger.monthly(months):
+        throughput = f"{timed_chars / seconds:9.0f}" if seconds else f"{'-':>9}"
+        print(f"{month:<8} {requests:9d} {billed:12,d} {cached:12,d} {throughput} {f'${estimate_cost(billed):,.2f}':>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Text-to-speech usage ledger.")
+    parser.add_argument("--ledger", default=LEDGER_FILE, help=f"Ledger database (default {LEDGER_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    report_parser = commands.add_parser("report", help="Per-month requests, throughput and estimated cost")
+    report_parser.add_argument("--months", type=int, default=12, help="How many recent months to show (default 12)")
+    args = parser.parse_args(argv)
+
+    ledger = UsageLedger(args.ledger)
+    try:
+        if args.command == "report":
+            report(ledger, args.months)
+    finally:
+        ledger.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Compare BeautifulSoup parser backends on saved pages
+#
+#   python bench_parsers.py                              # index_page_dump.html
+#   python bench_parsers.py page1.html page2.html --repeat 10
+
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+from td_crawl import extract_page, parse_cheat_sheet_links
+
+CANDIDATE_PARSERS = ("lxml", "html.parser", "html5lib")
+
+
+def best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), statistics.median(timings)
+
+
+def bench_file(path, parsers, repeat):
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    print(f"\n{path} ({len(html) / 1024:.0f} KiB, best/median of {repeat})")
+    print(f"{'parser':<12} {'parse':>16} {'links':>16} {'extract':>16}")
+
+    for parser in parsers:
+        row = [best_of(repeat, BeautifulSoup, html, parser)]
+        # The crawler prints progress; keep the table readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            row.append(best_of(repeat, parse_cheat_sheet_links, html, parser))
+            row.append(best_of(repeat, extract_page, html, path, parser))
+        cells = " ".join(f"{best * 1000:7.1f}/{median * 1000:6.1f}ms" for best, median in row)
+        print(f"{parser:<12} {cells}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on saved pages.")
+    parser.add_argument("files", nargs="*", default=["index_page_dump.html"], help="Saved HTML pages")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (default 5)")
+    args = parser.parse_args(argv)
+
+    parsers = [name for name in CANDIDATE_PARSERS if builder_registry.lookup(name)]
+    missing = sorted(set(CANDIDATE_PARSERS) - set(parsers))
+    if missing:
+        print(f"Not installed, skipped: {', '.join(missing)}")
+
+    for path in args.files:
+        bench_file(path, parsers, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
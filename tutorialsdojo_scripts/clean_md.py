@@ -1,60 +1,122 @@
+import argparse
+import hashlib
 import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from md_to_pdf import load_manifest, save_manifest
 
 INPUT_DIR = "tutorialsdojo_cheatsheets"
 OUTPUT_DIR = "tutorialsdojo_cheatsheets_clean"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+MANIFEST_FILE = ".clean_manifest.json"
 
-def clean_file(filename):
-    with open(os.path.join(INPUT_DIR, filename), "r", encoding="utf-8") as f:
-        lines = f.readlines()
+# A line containing any of these starts a block that is dropped up to the next heading or blank line
+SKIP_TRIGGERS = (
+    "validate your knowledge",
+    "subscribe to our newsletter",
+    "written by:",
+    "recent posts",
+    "references:",
+    "follow us on",
+    "view our aws",
+    "check out our free courses",
+    "did you find our content helpful",
+)
+# One alternation checks every trigger in a single scan of the line
+TRIGGER_RE = re.compile("|".join(re.escape(trigger) for trigger in SKIP_TRIGGERS))
+HEADING_RE = re.compile(r"^#{1,6}\s")
+NAV_DUMP_LENGTH = 400
+# Changing the rules must invalidate previously cleaned files
+RULES_VERSION = hashlib.sha256(f"{TRIGGER_RE.pattern}|{HEADING_RE.pattern}|{NAV_DUMP_LENGTH}".encode()).hexdigest()
 
-    cleaned_lines = []
+def clean_lines(lines):
+    """Yields the lines worth keeping from an iterable of markdown lines."""
     skip_mode = False
 
-    for i, line in enumerate(lines):
-        lower_line = line.lower()
-
+    for line in lines:
         # If we're skipping, continue skipping until we hit a new heading or blank line
         if skip_mode:
-            if re.match(r"^#{1,6}\s", line) or line.strip() == "":
+            if HEADING_RE.match(line) or line.strip() == "":
                 skip_mode = False
             else:
                 continue
 
         # Check for skip triggers (case-insensitive)
-        if any(trigger in lower_line for trigger in [
-            "validate your knowledge",
-            "subscribe to our newsletter",
-            "written by:",
-            "recent posts",
-            "references:",
-            "follow us on",
-            "view our aws",
-            "check out our free courses",
-            "did you find our content helpful"
-        ]):
+        if TRIGGER_RE.search(line.lower()):
             skip_mode = True
             continue
 
         # Filter out nav-dump style lines (super long single list items)
-        if line.startswith("- ") and len(line) > 400:
+        if line.startswith("- ") and len(line) > NAV_DUMP_LENGTH:
             continue
 
-        cleaned_lines.append(line)
+        yield line
+
+def clean_text(text):
+    """Cleans a whole markdown document held in memory, e.g. a page the crawler just scraped."""
+    return "".join(clean_lines(text.splitlines(keepends=True)))
+
+def file_hash(path):
+    digest = hashlib.sha256(RULES_VERSION.encode())
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def clean_file(filename, input_dir=INPUT_DIR, output_dir=OUTPUT_DIR, previous_hash=None):
+    """Streams one file through the cleaner. Returns (filename, input hash, outcome)."""
+    input_path = os.path.join(input_dir, filename)
+    output_path = os.path.join(output_dir, filename)
+    digest = file_hash(input_path)
+    if digest == previous_hash and os.path.exists(output_path):
+        return filename, digest, "unchanged"
+
+    kept = False
+    tmp_path = output_path + ".tmp"
+    with open(input_path, "r", encoding="utf-8") as src, open(tmp_path, "w", encoding="utf-8") as dst:
+        for line in clean_lines(src):
+            dst.write(line)
+            kept = True
 
     # Save cleaned output
-    if cleaned_lines:
-        with open(os.path.join(OUTPUT_DIR, filename), "w", encoding="utf-8") as f:
-            f.writelines(cleaned_lines)
+    if kept:
+        os.replace(tmp_path, output_path)
         print(f"Cleaned: {filename}")
-    else:
-        print(f"Skipped {filename}: Empty after cleaning.")
+        return filename, digest, "cleaned"
+    os.remove(tmp_path)
+    print(f"Skipped {filename}: Empty after cleaning.")
+    return filename, digest, "empty"
+
+def clean_dir(input_dir=INPUT_DIR, output_dir=OUTPUT_DIR, jobs=None, force=False):
+    started = time.monotonic()
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {} if force else load_manifest(output_dir, MANIFEST_FILE)
+    files = sorted(f for f in os.listdir(input_dir) if f.endswith(".md"))
+    previous = [manifest.get(f) for f in files]
+
+    outcomes = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(clean_file, files, [input_dir] * len(files), [output_dir] * len(files),
+                           previous, chunksize=16)
+        for filename, digest, outcome in results:
+            manifest[filename] = digest
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    save_manifest(output_dir, manifest, MANIFEST_FILE)
+    summary = ", ".join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items()))
+    print(f"{len(files)} files in {time.monotonic() - started:.1f}s: {summary or 'nothing to do'}.")
 
-def main():
-    files = [f for f in os.listdir(INPUT_DIR) if f.endswith(".md")]
-    for file in files:
-        clean_file(file)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Strip promo and navigation boilerplate from scraped cheat sheets.")
+    parser.add_argument("--input-dir", default=INPUT_DIR, help=f"Scraped markdown (default {INPUT_DIR})")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help=f"Cleaned markdown (default {OUTPUT_DIR})")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Clean every file even if its input is unchanged")
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    clean_dir(args.input_dir, args.output_dir, args.jobs, args.force)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,72 @@
+import sqlite3
+import time
+
+STATE_FILE = "crawl_state.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'pending',
+    last_fetched REAL,
+    etag TEXT,
+    last_modified TEXT,
+    last_updated TEXT,
+    content_hash TEXT,
+    filepath TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Statuses that mean the page was processed and only needs revalidating once stale
+DONE_STATUSES = ("ok", "skipped")
+
+
+class CrawlState:
+    """Per-URL crawl progress kept in SQLite so reruns can skip, retry and resume.
+
+    Every update is committed straight away, so an interrupted crawl loses at most
+    the pages that were in flight.
+    """
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def add_urls(self, urls):
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO pages (url) VALUES (?)", ((u,) for u in urls))
+
+    def urls(self):
+        return [row["url"] for row in self.conn.execute("SELECT url FROM pages ORDER BY url")]
+
+    def get(self, url):
+        row = self.conn.execute("SELECT * FROM pages WHERE url = ?", (url,)).fetchone()
+        return dict(row) if row else None
+
+    def is_fresh(self, url, max_age):
+        """True if the page was processed less than `max_age` seconds ago."""
+        page = self.get(url)
+        return bool(page and page["status"] in DONE_STATUSES and page["last_fetched"]
+                    and time.time() - page["last_fetched"] < max_age)
+
+    def record(self, url, status, **fields):
+        fields.update(status=status, last_fetched=time.time())
+        if status == "error":
+            fields.setdefault("error", None)
+        else:
+            fields["error"] = None
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self.conn:
+            self.conn.execute(
+                f"UPDATE pages SET {columns}, attempts = attempts + 1 WHERE url = ?",
+                (*fields.values(), url),
+            )
+
+    def summary(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM pages GROUP BY status").fetchall())
@@ -0,0 +1,233 @@
+# Strip paragraphs that repeat across many cheat sheets
+#
+#   python dedupe_md.py --dry-run            # report only
+#   python dedupe_md.py --min-files 5
+#
+# clean_md.py drops boilerplate it has a trigger phrase for; this catches the rest by
+# looking at the whole corpus. Paragraphs are compared by MinHash signatures of their
+# word shingles, with LSH banding so only paragraphs sharing a band are ever compared;
+# the cost grows with the number of paragraphs, not with the number of pairs. A group
+# of near-identical paragraphs found in at least --min-files sheets is boilerplate and
+# is removed everywhere, and every removal is listed in the report. Headings, code and
+# blocks of a few words are never removed; fenced code is never split on its blank lines.
+
+import argparse
+import csv
+import hashlib
+import os
+import random
+import re
+import time
+from collections import defaultdict
+
+from clean_md import OUTPUT_DIR as CLEAN_DIR
+
+REPORT_FILE = "dedupe_report.csv"
+DEFAULT_MIN_FILES = 5
+DEFAULT_SIMILARITY = 0.7  # estimated Jaccard similarity of shingles to count as the same block
+SHINGLE_WORDS = 5
+MIN_BLOCK_WORDS = 8  # shorter blocks ("- Yes", "Pricing:") repeat naturally and are never removed
+NUM_HASHES = 64
+BANDS = 16  # 16 bands of 4 rows: pairs above ~0.7 similarity share a band 99% of the time
+ROWS = NUM_HASHES // BANDS
+MERSENNE_PRIME = (1 << 61) - 1
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+WORD_RE = re.compile(r"\w+")
+
+# Fixed seed: signatures must not change between runs
+_rng = random.Random(1729)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_HASHES)]
+
+
+def split_blocks(text):
+    """Splits markdown on blank lines, keeping each fenced code block whole."""
+    blocks = []
+    lines = []
+    fence = None
+    for line in text.split("\n"):
+        match = FENCE_RE.match(line)
+        if match and fence is None:
+            fence = match.group(1)
+        elif match and match.group(1) == fence:
+            fence = None
+        if not line.strip() and fence is None:
+            if lines:
+                blocks.append("\n".join(lines))
+            lines = []
+        else:
+            lines.append(line)
+    if lines:
+        blocks.append("\n".join(lines))
+    return blocks
+
+
+def is_code(block):
+    lines = [line for line in block.split("\n") if line.strip()]
+    return any(FENCE_RE.match(line) for line in lines) or all(line.startswith(("    ", "\t")) for line in lines)
+
+
+def is_protected(block):
+    """Blocks that are never removed, however often they repeat."""
+    # Headings repeat by design ("## Features", "## Pricing") and hold the sheet's structure;
+    # code is content even when it is the same `aws configure` everywhere
+    return block.lstrip().startswith("#") or is_code(block) or len(normalize(block)) < MIN_BLOCK_WORDS
+
+
+def normalize(block):
+    return WORD_RE.findall(block.lower())
+
+
+def hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(words):
+    """MinHash signature of the block's word shingles (or its single shingle if it is short)."""
+    shingles = {hash64(" ".join(words[i:i + SHINGLE_WORDS]))
+                for i in range(max(1, len(words) - SHINGLE_WORDS + 1))}
+    return tuple(min((a * s + b) % MERSENNE_PRIME for s in shingles) for a, b in PERMUTATIONS)
+
+
+def similarity(sig_a, sig_b):
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_HASHES
+
+
+class Clusters:
+    """Union-find over block keys."""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, key):
+        self.parent.setdefault(key, key)
+        while self.parent[key] != key:
+            self.parent[key] = self.parent[self.parent[key]]
+            key = self.parent[key]
+        return key
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+
+def find_boilerplate(blocks_by_file, min_files=DEFAULT_MIN_FILES, threshold=DEFAULT_SIMILARITY):
+    """Returns {exact key: cluster id} for every block that belongs to a repeated cluster,
+    plus the clusters' details for the report."""
+    # Exact repeats collapse to one representative first, so a promo block pasted into
+    # 300 sheets is signed once and never compared 300 times
+    files_by_key = defaultdict(set)
+    sample = {}
+    words_by_key = {}
+    for filename, blocks in blocks_by_file.items():
+        for block in blocks:
+            if is_protected(block):
+                continue
+            words = normalize(block)
+            key = hash64(" ".join(words))
+            files_by_key[key].add(filename)
+            sample.setdefault(key, block)
+            words_by_key[key] = words
+
+    clusters = Clusters()
+    buckets = {}
+    for key, words in words_by_key.items():
+        signature = minhash(words)
+        clusters.find(key)
+        for band in range(BANDS):
+            bucket = (band, signature[band * ROWS:(band + 1) * ROWS])
+            head = buckets.setdefault(bucket, (key, signature))
+            # Only ever compare against the bucket's first member: linear, not pairwise
+            if head[0] != key and similarity(head[1], signature) >= threshold:
+                clusters.union(key, head[0])
+
+    members = defaultdict(list)
+    for key in words_by_key:
+        members[clusters.find(key)].append(key)
+
+    removed = {}
+    report = []
+    for root, keys in members.items():
+        files = set().union(*(files_by_key[key] for key in keys))
+        if len(files) < min_files:
+            continue
+        for key in keys:
+            removed[key] = root
+        report.append({"cluster": f"{root:016x}", "files": len(files), "variants": len(keys),
+                       "sample": " ".join(sample[keys[0]].split())[:200]})
+    return removed, report
+
+
+def strip_blocks(blocks, removed):
+    """Drops repeated blocks. Returns (kept blocks, {cluster: count removed}, chars removed)."""
+    kept = []
+    dropped = defaultdict(int)
+    chars = 0
+    for block in blocks:
+        key = None if is_protected(block) else hash64(" ".join(normalize(block)))
+        if key in removed:
+            dropped[removed[key]] += 1
+            chars += len(block)
+        else:
+            kept.append(block)
+    return kept, dropped, chars
+
+
+def dedupe_dir(input_dir=CLEAN_DIR, output_dir=None, min_files=DEFAULT_MIN_FILES,
+               threshold=DEFAULT_SIMILARITY, dry_run=False, report_path=REPORT_FILE):
+    started = time.monotonic()
+    output_dir = output_dir or input_dir
+    files = sorted(f for f in os.listdir(input_dir) if f.endswith(".md"))
+    blocks_by_file = {}
+    for filename in files:
+        with open(os.path.join(input_dir, filename), "r", encoding="utf-8") as f:
+            blocks_by_file[filename] = split_blocks(f.read())
+    total_blocks = sum(len(blocks) for blocks in blocks_by_file.values())
+
+    removed, clusters = find_boilerplate(blocks_by_file, min_files, threshold)
+    blocks_removed = defaultdict(int)
+    chars_removed = 0
+    changed = 0
+    os.makedirs(output_dir, exist_ok=True)
+    for filename, blocks in blocks_by_file.items():
+        kept, dropped, chars = strip_blocks(blocks, removed)
+        for cluster, count in dropped.items():
+            blocks_removed[cluster] += count
+        chars_removed += chars
+        if not dropped and output_dir == input_dir:
+            continue
+        changed += bool(dropped)
+        if not dry_run:
+            path = os.path.join(output_dir, filename)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write("\n\n".join(block.strip("\n") for block in kept) + "\n")
+            os.replace(path + ".tmp", path)
+
+    for cluster in clusters:
+        cluster["blocks_removed"] = blocks_removed[int(cluster["cluster"], 16)]
+    clusters.sort(key=lambda c: c["blocks_removed"], reverse=True)
+    with open(report_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["cluster", "files", "variants", "blocks_removed", "sample"])
+        writer.writeheader()
+        writer.writerows(clusters)
+
+    verb = "Would remove" if dry_run else "Removed"
+    print(f"{verb} {sum(blocks_removed.values())} of {total_blocks} blocks ({chars_removed:,} chars) "
+          f"in {len(clusters)} repeated groups from {changed} of {len(files)} files "
+          f"in {time.monotonic() - started:.1f}s. Report: {report_path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Remove paragraphs repeated across many cheat sheets.")
+    parser.add_argument("--input-dir", default=CLEAN_DIR, help=f"Cleaned markdown (default {CLEAN_DIR})")
+    parser.add_argument("--output-dir", help="Where to write the deduplicated files (default: in place)")
+    parser.add_argument("--min-files", type=int, default=DEFAULT_MIN_FILES,
+                        help=f"A block found in at least this many sheets is boilerplate (default {DEFAULT_MIN_FILES})")
+    parser.add_argument("--similarity", type=float, default=DEFAULT_SIMILARITY,
+                        help=f"How alike two blocks must be to count as the same, 0-1 (default {DEFAULT_SIMILARITY})")
+    parser.add_argument("--report", default=REPORT_FILE, help=f"CSV of what was removed (default {REPORT_FILE})")
+    parser.add_argument("--dry-run", action="store_true", help="Write the report but leave the files alone")
+    args = parser.parse_args(argv)
+    dedupe_dir(args.input_dir, args.output_dir, args.min_files, args.similarity, args.dry_run, args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,144 @@
 # Convert MD to PDF
 
+import argparse
+import hashlib
+import json
 import os
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-INPUT_DIR = "tutorialsdojo_cheatsheets"
+INPUT_DIR = "tutorialsdojo_cheatsheets_clean"  # what clean_md.py (or td_pipeline.py) writes
 OUTPUT_DIR = "tutorialsdojo_cheatsheets_pdf"
+MANIFEST_FILE = ".pdf_manifest.json"
+BOOK_FILE = "aws_cheat_sheets.pdf"
+BOOK_KEY = "__book__"  # manifest entry for the combined book
+PANDOC_OPTIONS = ["--pdf-engine=xelatex", "--toc", "--highlight-style", "tango"]
+BOOK_OPTIONS = ["--file-scope", "--top-level-division=chapter", "--toc-depth=2",
+                "--metadata", "title=AWS Cheat Sheets"]
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+def run_pandoc(input_files, output_file, extra_options=()):
+    subprocess.run([
+        "pandoc",
+        *input_files,
+        "-o",
+        output_file,
+        *PANDOC_OPTIONS,
+        *extra_options,
+    ], check=True)
 
 def convert_md_to_pdf(input_file, output_file):
     try:
-        subprocess.run([
-            "pandoc",
-            input_file,
-            "-o",
-            output_file,
-            "--pdf-engine=xelatex",
-            "--toc",
-            "--highlight-style", "tango"
-        ], check=True)
+        run_pandoc([input_file], output_file)
         print(f"Converted: {input_file} → {output_file}")
+        return True
     except subprocess.CalledProcessError as e:
         print(f"Error converting {input_file}: {e}")
+        return False
 
-def batch_convert():
-    for filename in os.listdir(INPUT_DIR):
-        if filename.endswith(".md"):
-            input_path = os.path.join(INPUT_DIR, filename)
-            output_filename = filename.replace(".md", ".pdf")
-            output_path = os.path.join(OUTPUT_DIR, output_filename)
-            convert_md_to_pdf(input_path, output_path)
+def source_hash(paths, options=PANDOC_OPTIONS):
+    """Hash of the markdown and the pandoc options, so either changing forces a rebuild."""
+    digest = hashlib.sha256(" ".join(options).encode("utf-8"))
+    for path in paths:
+        digest.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def load_manifest(output_dir, filename=MANIFEST_FILE):
+    """{file: hash} of what a previous run produced; clean_md and pic_to_text keep theirs the same way."""
+    path = os.path.join(output_dir, filename)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+def save_manifest(output_dir, manifest, filename=MANIFEST_FILE):
+    path = os.path.join(output_dir, filename)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def markdown_files(input_dir):
+    return sorted(f for f in os.listdir(input_dir) if f.endswith(".md"))
+
+def batch_convert(input_dir=INPUT_DIR, output_dir=OUTPUT_DIR, jobs=None, force=False):
+    """Converts every markdown file to its own PDF, `jobs` pandoc processes at a time.
+
+    Files whose markdown hash matches the manifest from the previous run are skipped.
+    """
+    started = time.monotonic()
+    manifest = load_manifest(output_dir)
+    pending = {}
+    skipped = 0
+    for filename in markdown_files(input_dir):
+        input_path = os.path.join(input_dir, filename)
+        output_path = os.path.join(output_dir, filename.replace(".md", ".pdf"))
+        digest = source_hash([input_path])
+        if not force and manifest.get(filename) == digest and os.path.exists(output_path):
+            skipped += 1
+            continue
+        pending[filename] = (input_path, output_path, digest)
+
+    print(f"{len(pending)} to convert, {skipped} unchanged, using {jobs or os.cpu_count()} jobs.")
+    failed = 0
+    # pandoc/xelatex do the work in their own processes; threads only wait on them
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(convert_md_to_pdf, input_path, output_path): (filename, digest)
+                   for filename, (input_path, output_path, digest) in pending.items()}
+        for future in as_completed(futures):
+            filename, digest = futures[future]
+            if future.result():
+                manifest[filename] = digest
+                save_manifest(output_dir, manifest)
+            else:
+                failed += 1
+
+    print(f"Converted {len(pending) - failed}, skipped {skipped}, failed {failed} "
+          f"in {time.monotonic() - started:.1f}s.")
+
+def build_book(input_dir=INPUT_DIR, output_dir=OUTPUT_DIR, force=False):
+    """Converts every markdown file into one PDF with a single merged table of contents."""
+    input_paths = [os.path.join(input_dir, f) for f in markdown_files(input_dir)]
+    if not input_paths:
+        # pandoc with no input files would sit reading stdin
+        print(f"No markdown files in {input_dir}; nothing to build.")
+        return
+    output_path = os.path.join(output_dir, BOOK_FILE)
+    manifest = load_manifest(output_dir)
+    digest = source_hash(input_paths, PANDOC_OPTIONS + BOOK_OPTIONS)
+    if not force and manifest.get(BOOK_KEY) == digest and os.path.exists(output_path):
+        print(f"{output_path} is up to date.")
+        return
+
+    started = time.monotonic()
+    try:
+        run_pandoc(input_paths, output_path, BOOK_OPTIONS)
+    except subprocess.CalledProcessError as e:
+        print(f"Error building {output_path}: {e}")
+        return
+    manifest[BOOK_KEY] = digest
+    save_manifest(output_dir, manifest)
+    print(f"Built {len(input_paths)} cheat sheets into {output_path} in {time.monotonic() - started:.1f}s.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the cheat sheet markdown files to PDF with pandoc.")
+    parser.add_argument("--input-dir", default=INPUT_DIR, help=f"Markdown directory (default {INPUT_DIR})")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help=f"PDF directory (default {OUTPUT_DIR})")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="Number of pandoc processes run at once (default: CPU count)")
+    parser.add_argument("--book", action="store_true",
+                        help=f"Build a single {BOOK_FILE} with a merged table of contents instead")
+    parser.add_argument("--force", action="store_true", help="Convert even if the markdown is unchanged")
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    if args.book:
+        build_book(args.input_dir, args.output_dir, args.force)
+    else:
+        batch_convert(args.input_dir, args.output_dir, args.jobs, args.force)
 
 if __name__ == "__main__":
-    batch_convert()
+    main()
@@ -1,118 +1,514 @@
+import argparse
+import asyncio
+import csv
+import hashlib
 import os
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+import httpx
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+
+from crawl_state import CrawlState, DONE_STATUSES, STATE_FILE
+
+# The HTTP client and cache are shared with the generic scraper
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "simple_web_scraper"))
+from http_cache import HttpCache  # noqa: E402
+from http_client import AsyncHttpClient  # noqa: E402
 
 BASE_URL = "https://tutorialsdojo.com/aws-cheat-sheets/"
 OUTPUT_DIR = "tutorialsdojo_cheatsheets"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+TIMINGS_FILE = "crawl_timings.csv"
+DEFAULT_CONCURRENCY = 4
+DEFAULT_HOST_DELAY = 0.5  # seconds between requests to the same host
+DEFAULT_MAX_AGE_HOURS = 24  # pages processed more recently are not refetched
+HTTP_TIMEOUT = 30  # seconds
+CACHE_DIR = os.path.join(OUTPUT_DIR, "http_cache")
+DEFAULT_CACHE_MB = 500
+RENDER_METHOD = "RENDER"  # cache key for browser-rendered HTML, next to the plain GET
+
+MARKER_RE = re.compile("last updated on", re.IGNORECASE)
+LAST_UPDATED_RE = re.compile(r"last updated on\s*:?\s*([A-Za-z]+\.? \d{1,2},? \d{4}|\d{4}-\d{2}-\d{2})",
+                             re.IGNORECASE)
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+TEXT_TAGS = {'p', 'div', 'section', 'span'}
+LIST_TAGS = {'ul', 'ol'}
+CODE_TAGS = {'pre', 'code'}
+STOP_TAGS = {'footer', 'nav'}
+STOP_IDS = {'footer', 'site-footer'}
+
+# Fastest first; lxml is only registered with BeautifulSoup when it is installed
+PARSER_BACKENDS = ("lxml", "html.parser")
+HTML_PARSER = next(name for name in PARSER_BACKENDS if builder_registry.lookup(name))  # --parser overrides
+
+# Used by --block-resources: the scraper only reads the article HTML
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+FIRST_PARTY_HOSTS = {"tutorialsdojo.com", "www.tutorialsdojo.com"}
+
+
+class HostRateLimiter:
+    """Spaces out requests to the same host by at least `min_interval` seconds."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, url):
+        host = urlparse(url).netloc
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def is_first_party(url):
+    return urlparse(url).hostname in FIRST_PARTY_HOSTS
+
+
+async def block_heavy_resources(route):
+    request = route.request
+    # Third-party requests are analytics, ads and embeds; none carry article content
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or not is_first_party(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
 
 def get_cheat_sheet_links_playwright():
+    from playwright.sync_api import sync_playwright  # imported on use: the browser is the fallback
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False)  # Set to True later for full headless
         page = browser.new_page()
         print(f"Loading index page: {BASE_URL}")
-        page.goto(BASE_URL)
-        page.wait_for_timeout(5000)
+        page.goto(BASE_URL, wait_until="domcontentloaded")
+        page.wait_for_selector("li.menu-item", state="attached")
 
         html = page.content()
         with open('index_page_dump.html', 'w', encoding='utf-8') as f:
             f.write(html)
         browser.close()
 
-        soup = BeautifulSoup(html, 'html.parser')
-        links = []
+        return parse_cheat_sheet_links(html)
 
-        # Find AWS Cheat Sheets menu block
-        aws_menu_root = None
-        for li in soup.select('li.menu-item'):
-            anchor = li.find('a')
-            if anchor and 'AWS Cheat Sheets' in anchor.get_text():
-                aws_menu_root = li
-                break
 
-        if aws_menu_root:
-            for a in aws_menu_root.select('ul.sub-menu a[href^="https://tutorialsdojo.com/"]'):
-                href = a['href']
-                links.append(href)
+def pick_parser(preferred="auto"):
+    """Returns the fastest installed BeautifulSoup tree builder, or `preferred` if it is installed."""
+    candidates = PARSER_BACKENDS if preferred == "auto" else (preferred,)
+    for name in candidates:
+        if builder_registry.lookup(name):
+            return name
+    print(f"Parser '{preferred}' is not installed; falling back to html.parser.")
+    return "html.parser"
 
-        print(f"Filtered {len(links)} AWS Cheat Sheet links.")
-        return sorted(set(links))
 
-def scrape_and_save(browser, url):
-    try:
-        page = browser.new_page()
-        print(f"Scraping: {url}")
-        page.goto(url)
-        html = page.content()
-        page.close()
+def parse_cheat_sheet_links(html, parser=None):
+    # Only the navigation menu is needed, so skip building the rest of the 1.5MB page. The strainer
+    # matches on the tag name alone: a class filter is compared with the whole class attribute
+    # while parsing, and every menu <li> carries several classes, so it would match nothing.
+    soup = BeautifulSoup(html, parser or HTML_PARSER, parse_only=SoupStrainer('li'))
+    links = []
 
-        soup = BeautifulSoup(html, 'html.parser')
-        h1 = soup.find('h1')
-        if h1 is None:
-            print(f"Skipping {url}: No H1 title found.")
-            return
+    # Find AWS Cheat Sheets menu block
+    aws_menu_root = None
+    for li in soup.select('li.menu-item'):
+        anchor = li.find('a')
+        if anchor and 'AWS Cheat Sheets' in anchor.get_text():
+            aws_menu_root = li
+            break
 
-        title = h1.get_text(strip=True)
-        filename = f"{title.replace(' ', '_').replace('/', '_')}.md"
-        filepath = os.path.join(OUTPUT_DIR, filename)
+    if aws_menu_root:
+        for a in aws_menu_root.select('ul.sub-menu a[href^="https://tutorialsdojo.com/"]'):
+            href = a['href']
+            links.append(href)
 
-        content = [f"# {title}\n\n"]
+    print(f"Filtered {len(links)} AWS Cheat Sheet links.")
+    return sorted(set(links))
 
-        # Find the "Last updated on" marker (now handles nested tags like <strong>)
-        start_tag = soup.find(lambda tag: tag.name == 'p' and "last updated on" in tag.get_text(strip=True).lower())
 
-        if not start_tag:
+def find_marker(soup):
+    """Finds the "Last updated on" paragraph, including when it is wrapped in tags like <strong>."""
+    for string in soup.find_all(string=MARKER_RE):
+        paragraph = string.find_parent('p')
+        if paragraph is not None:
+            return paragraph
+    # The phrase itself is split across inline tags; fall back to comparing full paragraph text
+    return soup.find(lambda tag: tag.name == 'p' and MARKER_RE.search(tag.get_text(strip=True)))
+
+
+def extract_page(html, url, parser=None, quiet=False):
+    """Returns (title, markdown lines, "Last updated on" date) for a cheat sheet page,
+    or None if it can't be parsed."""
+    soup = BeautifulSoup(html, parser or HTML_PARSER)
+    h1 = soup.find('h1')
+    if h1 is None:
+        if not quiet:
+            print(f"Skipping {url}: No H1 title found.")
+        return None
+
+    title = h1.get_text(strip=True)
+    content = [f"# {title}\n\n"]
+
+    start_tag = find_marker(soup)
+    if not start_tag:
+        if not quiet:
             print(f"Skipping {url}: Couldn't find 'Last updated on' marker.")
-            return
+        return None
 
-        # Start collecting content from the next siblings after the marker
-        for tag in start_tag.next_siblings:
-            if getattr(tag, 'name', None) in ['footer', 'nav'] or \
-               (getattr(tag, 'get', lambda x: None)('id') in ['footer', 'site-footer']):
-                break
+    match = LAST_UPDATED_RE.search(start_tag.get_text(" ", strip=True))
+    last_updated = match.group(1) if match else None
 
-            if not getattr(tag, 'name', None):
-                continue  # Skip text nodes, comments, etc.
+    # Single pass over the siblings after the marker; text is only pulled from tags that are kept
+    for tag in start_tag.next_siblings:
+        name = getattr(tag, 'name', None)
+        if not name:
+            continue  # Skip text nodes, comments, etc.
+        if name in STOP_TAGS or tag.get('id') in STOP_IDS:
+            break
 
+        if name in HEADING_TAGS:
             text = tag.get_text(strip=True)
-            if not text:
-                continue
-
-            if tag.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                level = int(tag.name[1])
-                content.append(f"{'#' * level} {text}\n\n")
-            elif tag.name == 'p':
+            if text:
+                content.append(f"{'#' * int(name[1])} {text}\n\n")
+        elif name in TEXT_TAGS:
+            text = tag.get_text(strip=True)
+            if text:
                 content.append(f"{text}\n\n")
-            elif tag.name in ['ul', 'ol']:
-                for li in tag.find_all('li'):
-                    content.append(f"- {li.get_text(strip=True)}\n")
+        elif name in LIST_TAGS:
+            items = [li.get_text(strip=True) for li in tag.find_all('li')]
+            if any(items):
+                content.extend(f"- {item}\n" for item in items)
                 content.append("\n")
-            elif tag.name in ['pre', 'code']:
-                content.append(f"```\n{tag.get_text()}\n```\n\n")
-            elif tag.name in ['div', 'section', 'span']:
-                content.append(f"{text}\n\n")
+        elif name in CODE_TAGS:
+            text = tag.get_text()
+            if text.strip():
+                content.append(f"```\n{text}\n```\n\n")
+
+    return title, content, last_updated
+
+
+def page_filepath(title):
+    filename = f"{title.replace(' ', '_').replace('/', '_')}.md"
+    return os.path.join(OUTPUT_DIR, filename)
+
+
+def content_hash(content):
+    return hashlib.sha256("".join(content).encode("utf-8")).hexdigest()
+
+
+def save_page(filepath, content):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.writelines(content)
+    print(f"Saved: {filepath}")
+
+
+class BrowserPool:
+    """Headless Chromium with a pool of contexts, launched only when a page first needs rendering."""
+
+    def __init__(self, size, block_resources=False, cache=None):
+        self.size = size
+        self.block_resources = block_resources
+        self.cache = cache
+        self.wait_until = "domcontentloaded" if block_resources else "load"
+        self._playwright = None
+        self._browser = None
+        self._contexts = asyncio.Queue()
+        self._lock = asyncio.Lock()
+
+    async def _start(self):
+        async with self._lock:
+            if self._browser:
+                return
+            print("Launching headless browser for pages that need rendering.")
+            from playwright.async_api import async_playwright
 
-        if len(content) > 1:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.writelines(content)
-            print(f"Saved: {filepath}")
-        else:
-            print(f"Skipping {url}: No content collected after marker.")
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            for _ in range(self.size):
+                context = await self._browser.new_context()
+                if self.block_resources:
+                    await context.route("**/*", block_heavy_resources)
+                self._contexts.put_nowait(context)
 
+    async def render(self, url):
+        """Returns (html, response headers) after a full browser navigation to `url`.
+
+        With a cache the rendered HTML is stored too, and offline runs replay it instead
+        of launching the browser.
+        """
+        if self.cache and self.cache.offline:
+            entry = self.cache.get(RENDER_METHOD, url)
+            if entry is None:
+                raise LookupError(f"Offline mode: no rendered copy of {url} in the cache")
+            return entry.body.decode("utf-8"), entry.headers
+
+        await self._start()
+        context = await self._contexts.get()
+        try:
+            page = await context.new_page()
+            try:
+                response = await page.goto(url, wait_until=self.wait_until)
+                html, headers = await page.content(), (response.headers if response else {})
+            finally:
+                await page.close()
+        finally:
+            self._contexts.put_nowait(context)
+
+        if self.cache:
+            self.cache.put(RENDER_METHOD, url, 200, headers, html.encode("utf-8"))
+        return html, headers
+
+    async def close(self):
+        if self._browser:
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+
+
+def conditional_headers(known):
+    headers = {}
+    if known.get("etag"):
+        headers["If-None-Match"] = known["etag"]
+    if known.get("last_modified"):
+        headers["If-Modified-Since"] = known["last_modified"]
+    return headers
+
+
+def has_content(extracted):
+    return bool(extracted) and len(extracted[1]) > 1
+
+
+async def scrape_page(client, browser, url, limiter, state, force, http_first):
+    """Fetches, extracts and saves one page, recording the outcome in `state`.
+
+    Tries a plain HTTP GET first (conditional when the page is known) and only renders
+    in the browser when the H1 or the "Last updated on" marker is missing from the
+    server HTML. Returns (status, fetch path, seconds spent fetching, page), where page is
+    (filepath, content lines) for pages that were extracted and None otherwise.
+    """
+    known = state.get(url) or {}
+    # A 304 only helps while the markdown saved last time is still on disk; otherwise refetch in full
+    missing = known.get("status") == "ok" and not os.path.exists(known.get("filepath") or "")
+    revalidate = {} if force or missing or known.get("status") not in DONE_STATUSES else conditional_headers(known)
+    extracted = response = None
+    fetch_path = "browser"
+
+    await limiter.wait(url)
+    fetch_started = time.monotonic()
+    if http_first or revalidate:
+        try:
+            response = await client.get(url, headers=revalidate)
+        except httpx.HTTPError as e:
+            print(f"Plain GET failed for {url} ({e}); falling back to the browser.")
+            response = None
+    if response is not None:
+        if response.status_code == 304:
+            state.record(url, known["status"])
+            print(f"Not modified: {url}")
+            return "not-modified", "http", time.monotonic() - fetch_started, None
+        if http_first:
+            extracted = extract_page(response.text, url, quiet=True)
+            if has_content(extracted):
+                fetch_path = "http"
+                headers = response.headers
+                print(f"Fetched: {url}")
+
+    if fetch_path == "browser":
+        if http_first or revalidate:
+            # The plain GET already went to this host; the render is a second request and waits its turn
+            paused = time.monotonic()
+            await limiter.wait(url)
+            fetch_started += time.monotonic() - paused
+        print(f"Rendering: {url}")
+        html, headers = await browser.render(url)
+        extracted = extract_page(html, url)
+    fetch_seconds = time.monotonic() - fetch_started
+    validators = {"etag": headers.get("etag"), "last_modified": headers.get("last-modified")}
+
+    if not extracted:
+        state.record(url, "skipped", **validators)
+        return "skipped", fetch_path, fetch_seconds, None
+    title, content, last_updated = extracted
+    if len(content) <= 1:
+        print(f"Skipping {url}: No content collected after marker.")
+        state.record(url, "skipped", last_updated=last_updated, **validators)
+        return "skipped", fetch_path, fetch_seconds, None
+
+    filepath = page_filepath(title)
+    digest = content_hash(content)
+    if digest == known.get("content_hash") and os.path.exists(filepath):
+        print(f"Unchanged: {url} (last updated {last_updated})")
+        status = "unchanged"
+    else:
+        save_page(filepath, content)
+        status = "saved"
+    state.record(url, "ok", content_hash=digest, filepath=filepath,
+                 last_updated=last_updated, **validators)
+    return status, fetch_path, fetch_seconds, (filepath, content)
+
+
+async def scrape_and_save(client, browser, url, limiter, state, force=False, http_first=True):
+    """Scrapes one page over pooled HTTP or browser connections. Returns a timing record."""
+    started = time.monotonic()
+    try:
+        status, fetch_path, fetch_seconds, _ = await scrape_page(client, browser, url, limiter, state,
+                                                                 force, http_first)
     except Exception as e:
+        status, fetch_path, fetch_seconds = "error", None, time.monotonic() - started
         print(f"Error scraping {url}: {e}")
+        state.record(url, "error", error=str(e))
+
+    return {
+        "url": url,
+        "status": status,
+        "path": fetch_path,
+        "fetch_seconds": round(fetch_seconds, 3),
+        "total_seconds": round(time.monotonic() - started, 3),
+    }
 
-if __name__ == "__main__":
-    links = get_cheat_sheet_links_playwright()
-    print(f"\nFound {len(links)} AWS Cheat Sheet pages.\n")
 
-    with open('cheatsheet_urls.txt', 'w') as f:
-        f.write('\n'.join(links))
+async def crawl(links, state, timings, concurrency=DEFAULT_CONCURRENCY, host_delay=DEFAULT_HOST_DELAY,
+                block_resources=False, force=False, http_first=True, cache=None):
+    """Scrapes `links` with at most `concurrency` pages in flight, appending a timing
+    record per URL to `timings` as each one finishes."""
+    limiter = HostRateLimiter(host_delay)
+    browser = BrowserPool(concurrency, block_resources, cache)
+    slots = asyncio.Semaphore(concurrency)
 
+    async with AsyncHttpClient(concurrency=concurrency, timeout=HTTP_TIMEOUT, cache=cache) as client:
+        async def worker(url):
+            async with slots:
+                timings.append(await scrape_and_save(client, browser, url, limiter, state,
+                                                     force, http_first))
+
+        try:
+            await asyncio.gather(*(worker(link) for link in links))
+        finally:
+            await browser.close()
+
+
+def known_links(state, refresh_links=False, offline=False):
+    """Cheat sheet URLs from the crawl state, discovering them from the index page when
+    there are none yet or `refresh_links` is set. Returns None when offline with no state."""
+    links = state.urls()
+    if offline and not links:
+        print("Offline mode needs a previous crawl to know which pages to replay.")
+        return None
+    if (refresh_links and not offline) or not links:
+        links = get_cheat_sheet_links_playwright()
+        print(f"\nFound {len(links)} AWS Cheat Sheet pages.\n")
+
+        with open('cheatsheet_urls.txt', 'w') as f:
+            f.write('\n'.join(links))
+        state.add_urls(links)
+    else:
+        print(f"Reusing {len(links)} known AWS Cheat Sheet pages (use --refresh-links to rediscover).")
+    return links
+
+
+def stale_links(state, links, max_age_hours):
+    """The links not processed within the last `max_age_hours`."""
+    todo = [link for link in links if not state.is_fresh(link, max_age_hours * 3600)]
+    print(f"{len(links) - len(todo)} pages processed within the last {max_age_hours:g}h, "
+          f"{len(todo)} to check.\n")
+    return todo
+
+
+def write_timings(timings, wall_seconds):
+    path = os.path.join(OUTPUT_DIR, TIMINGS_FILE)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=["url", "status", "path", "fetch_seconds", "total_seconds"])
+        writer.writeheader()
+        writer.writerows(timings)
+
+    if not timings:
+        return
+    per_page = [t["total_seconds"] for t in timings]
+    print(f"\nCrawled {len(timings)} pages in {wall_seconds:.1f}s "
+          f"({len(timings) / wall_seconds:.2f} pages/s).")
+    print(f"Per page: mean {statistics.mean(per_page):.2f}s, "
+          f"median {statistics.median(per_page):.2f}s, max {max(per_page):.2f}s.")
+    paths = Counter(t["path"] or "failed" for t in timings)
+    print("Fetch paths: " + ", ".join(f"{name} {count}" for name, count in paths.most_common()))
+    print(f"Timings written to {path}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape the Tutorials Dojo AWS cheat sheets to markdown.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Number of pages scraped in parallel (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--host-delay", type=float, default=DEFAULT_HOST_DELAY,
+                        help=f"Minimum seconds between requests to the same host (default {DEFAULT_HOST_DELAY})")
+    parser.add_argument("--block-resources", action="store_true",
+                        help="When rendering, abort images, media, fonts, stylesheets and third-party "
+                             "requests, and stop waiting at DOMContentLoaded")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_MAX_AGE_HOURS,
+                        help="Skip pages processed within this many hours "
+                             f"(default {DEFAULT_MAX_AGE_HOURS}); older ones are revalidated")
+    parser.add_argument("--force", action="store_true",
+                        help="Refetch every page regardless of the crawl state")
+    parser.add_argument("--refresh-links", action="store_true",
+                        help="Rediscover cheat sheet links from the index page")
+    parser.add_argument("--browser-only", action="store_true",
+                        help="Render every page in the browser instead of trying plain HTTP first")
+    parser.add_argument("--cache", action="store_true",
+                        help=f"Keep fetched and rendered pages in an on-disk HTTP cache under {CACHE_DIR}")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_MB,
+                        help=f"Cache size limit in MB before least recently used pages are evicted "
+                             f"(default {DEFAULT_CACHE_MB})")
+    parser.add_argument("--offline", action="store_true",
+                        help="Re-extract every page from the cache without touching the network (implies --cache)")
+    parser.add_argument("--parser", default="auto", choices=("auto",) + PARSER_BACKENDS,
+                        help="BeautifulSoup backend (default: fastest installed)")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
+
+
+def main(argv=None):
+    global HTML_PARSER
+    args = parse_args(argv)
+    HTML_PARSER = pick_parser(args.parser)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    state = CrawlState(os.path.join(OUTPUT_DIR, STATE_FILE))
+
+    cache = None
+    if args.cache or args.offline:
+        cache = HttpCache(CACHE_DIR, max_bytes=args.cache_size * 1024 * 1024, offline=args.offline)
+    if args.offline:
+        # Replaying stored responses is for re-running extraction over every page
+        args.force, args.host_delay = True, 0
+
+    links = known_links(state, args.refresh_links, args.offline)
+    if links is None:
+        return
+    if not args.force:
+        links = stale_links(state, links, args.max_age)
+
+    timings = []
+    started = time.monotonic()
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            for link in links:
-                scrape_and_save(browser, link)
+        asyncio.run(crawl(links, state, timings, args.concurrency, args.host_delay, args.block_resources,
+                          args.force, not args.browser_only, cache))
     except KeyboardInterrupt:
-        print("\nScraping interrupted by user. Exiting gracefully.")
+        print("\nScraping interrupted by user. Progress saved; rerun to resume.")
+    finally:
+        write_timings(timings, time.monotonic() - started)
+        print(f"Crawl state: {state.summary()}")
+        state.close()
+        if cache:
+            print(f"HTTP cache: {cache.stats()}")
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
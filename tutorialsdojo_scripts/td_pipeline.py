@@ -0,0 +1,231 @@
+# Crawl, clean and convert the cheat sheets in one streaming pass
+#
+#   python td_pipeline.py
+#   python td_pipeline.py --crawl-concurrency 6 --clean-jobs 2 --pdf-jobs 4 --queue-size 8
+#
+# Each page flows crawl -> clean -> PDF as soon as it is scraped. The stages are joined
+# by bounded queues, so a slow stage holds back the ones before it instead of letting
+# work pile up, and the wall time is set by the slowest stage rather than the sum.
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from clean_md import OUTPUT_DIR as CLEAN_DIR, clean_text
+from crawl_state import CrawlState, STATE_FILE
+from md_to_pdf import OUTPUT_DIR as PDF_DIR, convert_md_to_pdf, load_manifest, save_manifest, source_hash
+from td_crawl import (DEFAULT_CONCURRENCY, DEFAULT_HOST_DELAY, DEFAULT_MAX_AGE_HOURS, HTTP_TIMEOUT, OUTPUT_DIR,
+                      AsyncHttpClient, BrowserPool, HostRateLimiter, known_links, scrape_page, stale_links)
+
+DEFAULT_CLEAN_JOBS = 2
+DEFAULT_PDF_JOBS = os.cpu_count() or 1
+DEFAULT_QUEUE_SIZE = 8
+DONE = None  # queue sentinel, one per downstream worker
+
+
+class StageStats:
+    """Items, latency and time spent blocked on a full downstream queue, for one stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.outcomes = {}
+        self.blocked = 0.0
+        self.first_start = self.last_end = None
+
+    def record(self, started, outcome):
+        now = time.monotonic()
+        self.latencies.append(now - started)
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.first_start = min(self.first_start or started, started)
+        self.last_end = now
+
+    async def put(self, queue, item):
+        # Time spent here is backpressure from the next stage
+        started = time.monotonic()
+        await queue.put(item)
+        self.blocked += time.monotonic() - started
+
+    def report(self):
+        if not self.latencies:
+            return f"{self.name:<6} nothing processed"
+        active = (self.last_end - self.first_start) or 1e-9
+        outcomes = ", ".join(f"{count} {outcome}" for outcome, count in sorted(self.outcomes.items()))
+        return (f"{self.name:<6} {len(self.latencies):4d} items in {active:6.1f}s "
+                f"({len(self.latencies) / active:5.2f}/s); latency mean {statistics.mean(self.latencies):5.2f}s, "
+                f"max {max(self.latencies):5.2f}s; blocked {self.blocked:5.1f}s; {outcomes}")
+
+
+def read_saved(page):
+    """(filepath, text) of a page saved by an earlier crawl, or None."""
+    filepath = (page or {}).get("filepath")
+    if not filepath or not os.path.exists(filepath):
+        return None
+    with open(filepath, "r", encoding="utf-8") as f:
+        return filepath, f.read()
+
+
+async def crawl_stage(links, fresh, state, out_queue, stats, concurrency, host_delay, block_resources,
+                      force, http_first, downstream_workers):
+    """Scrapes `links` and hands each page's markdown on; `fresh` pages come straight from disk."""
+    for url in fresh:
+        started = time.monotonic()
+        saved = read_saved(state.get(url))
+        if saved:
+            await stats.put(out_queue, saved)
+        stats.record(started, "fresh" if saved else "missing")
+
+    todo = asyncio.Queue()
+    for url in links:
+        todo.put_nowait(url)
+    limiter = HostRateLimiter(host_delay)
+    browser = BrowserPool(concurrency, block_resources)
+
+    async with AsyncHttpClient(concurrency=concurrency, timeout=HTTP_TIMEOUT) as client:
+        async def worker():
+            while not todo.empty():
+                url = todo.get_nowait()
+                started = time.monotonic()
+                try:
+                    status, _, _, page = await scrape_page(client, browser, url, limiter, state, force, http_first)
+                except Exception as e:
+                    print(f"Error scraping {url}: {e}")
+                    state.record(url, "error", error=str(e))
+                    stats.record(started, "error")
+                    continue
+                if page is not None:
+                    filepath, content = page
+                    page = filepath, "".join(content)
+                elif status == "not-modified":
+                    page = read_saved(state.get(url))
+                if page is not None:
+                    await stats.put(out_queue, page)
+                stats.record(started, status)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        finally:
+            await browser.close()
+            for _ in range(downstream_workers):
+                await out_queue.put(DONE)
+
+
+async def clean_stage(in_queue, out_queue, stats, pool, clean_dir, workers, downstream_workers):
+    """Cleans pages in memory in a process pool and writes them to `clean_dir`."""
+    loop = asyncio.get_running_loop()
+
+    async def worker():
+        while (item := await in_queue.get()) is not DONE:
+            started = time.monotonic()
+            filepath, text = item
+            cleaned = await loop.run_in_executor(pool, clean_text, text)
+            if not cleaned:
+                print(f"Skipped {os.path.basename(filepath)}: Empty after cleaning.")
+                stats.record(started, "empty")
+                continue
+            clean_path = os.path.join(clean_dir, os.path.basename(filepath))
+            with open(clean_path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(cleaned)
+            os.replace(clean_path + ".tmp", clean_path)
+            await stats.put(out_queue, clean_path)
+            stats.record(started, "cleaned")
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    for _ in range(downstream_workers):
+        await out_queue.put(DONE)
+
+
+async def pdf_stage(in_queue, stats, pdf_dir, workers, force):
+    """Converts cleaned markdown with pandoc, skipping files the PDF manifest says are current."""
+    manifest = load_manifest(pdf_dir)
+
+    async def worker():
+        while (clean_path := await in_queue.get()) is not DONE:
+            started = time.monotonic()
+            filename = os.path.basename(clean_path)
+            output_path = os.path.join(pdf_dir, filename.replace(".md", ".pdf"))
+            digest = source_hash([clean_path])
+            if not force and manifest.get(filename) == digest and os.path.exists(output_path):
+                stats.record(started, "unchanged")
+                continue
+            # pandoc/xelatex run in their own process; the thread only waits on it
+            if await asyncio.to_thread(convert_md_to_pdf, clean_path, output_path):
+                manifest[filename] = digest
+                save_manifest(pdf_dir, manifest)
+                stats.record(started, "converted")
+            else:
+                stats.record(started, "failed")
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+
+async def run_pipeline(links, fresh, state, args):
+    crawl_stats, clean_stats, pdf_stats = StageStats("crawl"), StageStats("clean"), StageStats("pdf")
+    to_clean = asyncio.Queue(maxsize=args.queue_size)
+    to_pdf = asyncio.Queue(maxsize=args.queue_size)
+
+    with ProcessPoolExecutor(max_workers=args.clean_jobs) as pool:
+        try:
+            await asyncio.gather(
+                crawl_stage(links, fresh, state, to_clean, crawl_stats, args.crawl_concurrency, args.host_delay,
+                            args.block_resources, args.force, not args.browser_only, args.clean_jobs),
+                clean_stage(to_clean, to_pdf, clean_stats, pool, args.clean_dir, args.clean_jobs, args.pdf_jobs),
+                pdf_stage(to_pdf, pdf_stats, args.pdf_dir, args.pdf_jobs, args.force),
+            )
+        finally:
+            print()
+            for stats in (crawl_stats, clean_stats, pdf_stats):
+                print(stats.report())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl, clean and convert the cheat sheets in one streaming pass.")
+    parser.add_argument("--crawl-concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Pages scraped in parallel (default {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--clean-jobs", type=int, default=DEFAULT_CLEAN_JOBS,
+                        help=f"Cleaner processes (default {DEFAULT_CLEAN_JOBS})")
+    parser.add_argument("--pdf-jobs", type=int, default=DEFAULT_PDF_JOBS,
+                        help=f"pandoc processes run at once (default {DEFAULT_PDF_JOBS})")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help=f"Pages buffered between stages before upstream waits (default {DEFAULT_QUEUE_SIZE})")
+    parser.add_argument("--host-delay", type=float, default=DEFAULT_HOST_DELAY,
+                        help=f"Minimum seconds between requests to the same host (default {DEFAULT_HOST_DELAY})")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_MAX_AGE_HOURS,
+                        help=f"Pages crawled within this many hours are taken from disk (default {DEFAULT_MAX_AGE_HOURS})")
+    parser.add_argument("--block-resources", action="store_true",
+                        help="When rendering, abort images, media, fonts, stylesheets and third-party requests")
+    parser.add_argument("--browser-only", action="store_true",
+                        help="Render every page in the browser instead of trying plain HTTP first")
+    parser.add_argument("--refresh-links", action="store_true",
+                        help="Rediscover cheat sheet links from the index page")
+    parser.add_argument("--clean-dir", default=CLEAN_DIR, help=f"Cleaned markdown (default {CLEAN_DIR})")
+    parser.add_argument("--pdf-dir", default=PDF_DIR, help=f"PDFs (default {PDF_DIR})")
+    parser.add_argument("--force", action="store_true", help="Refetch every page and rebuild every PDF")
+    args = parser.parse_args(argv)
+    for name in ("crawl_concurrency", "clean_jobs", "pdf_jobs", "queue_size"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name.replace('_', '-')} must be at least 1")
+
+    for directory in (OUTPUT_DIR, args.clean_dir, args.pdf_dir):
+        os.makedirs(directory, exist_ok=True)
+    state = CrawlState(os.path.join(OUTPUT_DIR, STATE_FILE))
+    links = known_links(state, args.refresh_links)
+    stale = links if args.force else stale_links(state, links, args.max_age)
+    pending = set(stale)
+    fresh = [link for link in links if link not in pending]
+
+    started = time.monotonic()
+    try:
+        asyncio.run(run_pipeline(stale, fresh, state, args))
+    except KeyboardInterrupt:
+        print("\nPipeline interrupted by user. Progress saved; rerun to resume.")
+    finally:
+        print(f"\nPipeline finished in {time.monotonic() - started:.1f}s. Crawl state: {state.summary()}")
+        state.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# Full-text search over the cleaned cheat sheets
+#
+#   python td_search.py index                      # (re)index changed files only
+#   python td_search.py query "s3 lifecycle glacier"
+#   python td_search.py query 'kinesis NEAR(shard limit)' --raw --limit 5
+#
+# Every "## " section of every sheet is its own document in an SQLite FTS5 index,
+# so a hit points at the part of the sheet that matters rather than the whole file.
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+from clean_md import OUTPUT_DIR as CLEAN_DIR
+
+INDEX_FILE = "td_search.sqlite"
+DEFAULT_LIMIT = 10
+# bm25 column weights: a match in the sheet title or section heading beats one in the body
+TITLE_WEIGHT, HEADING_WEIGHT, BODY_WEIGHT = 5.0, 3.0, 1.0
+SECTION_RE = re.compile(r"^## ", re.MULTILINE)
+TITLE_RE = re.compile(r"^# (.+)$", re.MULTILINE)
+TOKEN_RE = re.compile(r"\w+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    sections INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS sections USING fts5(
+    title, heading, body, path UNINDEXED, tokenize = 'porter unicode61'
+);
+"""
+
+QUERY = f"""
+SELECT title, heading, path, snippet(sections, 2, '[', ']', ' ... ', 16),
+       bm25(sections, {TITLE_WEIGHT}, {HEADING_WEIGHT}, {BODY_WEIGHT}) AS rank
+FROM sections
+WHERE sections MATCH ?
+ORDER BY rank
+LIMIT ?
+"""
+
+
+def connect(path=INDEX_FILE):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    try:
+        conn.executescript(SCHEMA)
+    except sqlite3.OperationalError as e:
+        raise SystemExit(f"This Python's SQLite has no FTS5 support: {e}")
+    return conn
+
+
+def split_sections(text, fallback_title):
+    """Returns (sheet title, [(heading, body), ...]) with one entry per "## " section.
+
+    Anything before the first "## " is kept under the sheet title; deeper headings stay
+    inside the section they belong to.
+    """
+    match = TITLE_RE.search(text)
+    title = match.group(1).strip() if match else fallback_title
+    sections = []
+    parts = SECTION_RE.split(text)
+    if parts[0].strip():
+        sections.append((title, parts[0].strip()))
+    for part in parts[1:]:
+        heading, _, body = part.partition("\n")
+        sections.append((heading.strip(), body.strip()))
+    return title, sections
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_index(conn, input_dir=CLEAN_DIR, force=False):
+    """Indexes new and changed markdown files and drops deleted ones. Unchanged files are not reread."""
+    started = time.monotonic()
+    indexed = dict(conn.execute("SELECT path, hash FROM files").fetchall())
+    paths = sorted(os.path.join(input_dir, f) for f in os.listdir(input_dir) if f.endswith(".md"))
+    counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+
+    with conn:
+        for path in paths:
+            digest = file_hash(path)
+            if not force and indexed.get(path) == digest:
+                counts["unchanged"] += 1
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                title, sections = split_sections(f.read(), os.path.splitext(os.path.basename(path))[0])
+            conn.execute("DELETE FROM sections WHERE path = ?", (path,))
+            conn.executemany("INSERT INTO sections (title, heading, body, path) VALUES (?, ?, ?, ?)",
+                             ((title, heading, body, path) for heading, body in sections))
+            conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                         (path, digest, len(sections), time.time()))
+            counts["updated" if path in indexed else "added"] += 1
+
+        for path in set(indexed) - set(paths):
+            conn.execute("DELETE FROM sections WHERE path = ?", (path,))
+            conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            counts["removed"] += 1
+
+    if counts["added"] or counts["updated"] or counts["removed"]:
+        conn.execute("INSERT INTO sections (sections) VALUES ('optimize')")
+        conn.commit()
+    total = conn.execute("SELECT COUNT(*), COALESCE(SUM(sections), 0) FROM files").fetchone()
+    summary = ", ".join(f"{count} {outcome}" for outcome, count in counts.items())
+    print(f"Indexed {input_dir} in {time.monotonic() - started:.2f}s: {summary}. "
+          f"{total[0]} sheets, {total[1]} sections.")
+
+
+def to_match(query, raw=False):
+    """Plain queries match every word (as a phrase-safe token); --raw passes FTS5 syntax through."""
+    if raw:
+        return query
+    return " ".join(f'"{token}"' for token in TOKEN_RE.findall(query))
+
+
+def search(conn, query, limit=DEFAULT_LIMIT, raw=False):
+    """Returns [(title, heading, path, snippet, rank), ...], best first."""
+    match = to_match(query, raw)
+    if not match:
+        return []
+    return conn.execute(QUERY, (match, limit)).fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search the cleaned cheat sheets by section.")
+    parser.add_argument("--index-file", default=INDEX_FILE, help=f"Index database (default {INDEX_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    index_parser = commands.add_parser("index", help="Index new and changed markdown files")
+    index_parser.add_argument("--input-dir", default=CLEAN_DIR, help=f"Markdown to index (default {CLEAN_DIR})")
+    index_parser.add_argument("--force", action="store_true", help="Reindex every file even if unchanged")
+    query_parser = commands.add_parser("query", help="Show the best matching sections")
+    query_parser.add_argument("query", help="Words to look for")
+    query_parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help=f"Results to show (default {DEFAULT_LIMIT})")
+    query_parser.add_argument("--raw", action="store_true",
+                              help="Treat the query as FTS5 syntax (AND/OR/NOT, NEAR, prefix*, column:)")
+    args = parser.parse_args(argv)
+
+    conn = connect(args.index_file)
+    try:
+        if args.command == "index":
+            build_index(conn, args.input_dir, args.force)
+            return
+        started = time.perf_counter()
+        try:
+            results = search(conn, args.query, args.limit, args.raw)
+        except sqlite3.OperationalError as e:
+            print(f"Bad query: {e}")
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for title, heading, path, snippet, _ in results:
+            section = title if heading == title else f"{title} > {heading}"
+            print(f"{section}\n    {path}\n    {' '.join(snippet.split())}\n")
+        print(f"{len(results)} results in {elapsed_ms:.1f}ms")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()